@@ -1,11 +1,14 @@
+import io
 import os
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
-from selenium.webdriver.remote.webdriver import WebDriver
+from typing import Optional, Dict, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 # Set up logging
 def setup_logging():
@@ -53,7 +56,8 @@ class HTMLAnalyzer:
         logger.info("HTML Analyzer initialized")
         self._initialized = True
 
-    def analyze_page(self, url: str, driver: Optional[WebDriver] = None, save_html: bool = False) -> Optional[str]:
+    def analyze_page(self, url: str, driver: Optional['WebDriver'] = None, save_html: bool = False,
+                     page_source: Optional[str] = None) -> Optional[str]:
         """
         Analyze a webpage and save relevant information for debugging
         
@@ -61,6 +65,7 @@ class HTMLAnalyzer:
             url: URL to analyze
             driver: Optional WebDriver instance for dynamic content
             save_html: Whether to save the raw HTML content
+            page_source: Already fetched page content to analyze instead of fetching the URL
             
         Returns:
             str: Path to the debug file
@@ -69,92 +74,97 @@ class HTMLAnalyzer:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             debug_file = self.output_dir / f'page_analysis_{timestamp}.txt'
             
-            logger.info(f"Analyzing page: {url}")
+            logger.info("Analyzing page: %s", url)
             
             # Get page content
-            if driver:
+            if page_source is not None:
+                content_type = 'Pre-fetched'
+            elif driver:
                 page_source = driver.page_source
+                content_type = 'From WebDriver'
             else:
                 response = requests.get(url, headers=self.headers, timeout=30)
                 response.raise_for_status()
                 page_source = response.text
+                content_type = response.headers.get('content-type', 'N/A')
             
             # Save raw HTML if requested
             if save_html:
                 html_file = self.output_dir / f'raw_html_{timestamp}.html'
                 html_file.write_text(page_source, encoding='utf-8')
-                logger.info(f"Raw HTML saved to: {html_file}")
+                logger.info("Raw HTML saved to: %s", html_file)
 
             soup = BeautifulSoup(page_source, 'html.parser')
-            
-            with open(debug_file, 'w', encoding='utf-8') as f:
-                # Basic Information
-                f.write(f"=== PAGE ANALYSIS ===\n")
-                f.write(f"URL: {url}\n")
-                f.write(f"Timestamp: {timestamp}\n")
-                f.write(f"Content Type: {response.headers.get('content-type', 'N/A') if not driver else 'From WebDriver'}\n\n")
-
-                # Page Title and Meta
-                f.write("=== PAGE METADATA ===\n")
-                title = soup.find('title')
-                f.write(f"Title: {title.text if title else 'No title found'}\n")
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                f.write(f"Description: {meta_desc['content'] if meta_desc else 'No description found'}\n\n")
-
-                # Table Analysis
-                f.write("=== TABLE ANALYSIS ===\n")
-                tables = soup.find_all('table')
-                for idx, table in enumerate(tables, 1):
-                    f.write(f"\nTable #{idx}\n")
-                    f.write(f"ID: {table.get('id', 'No ID')}\n")
-                    f.write(f"Class: {' '.join(table.get('class', []))}\n")
-                    
-                    # Analyze headers
-                    headers = table.find_all('th')
-                    if headers:
-                        f.write("Headers:\n")
-                        for header in headers:
-                            data_stat = header.get('data-stat', 'No data-stat')
-                            text = header.text.strip()
-                            f.write(f"  - {text} (data-stat: {data_stat})\n")
-                    
-                    # Sample first row data
-                    first_row = table.find('tr', class_=lambda x: x != 'thead')
-                    if first_row:
-                        f.write("Sample Row Data:\n")
-                        cells = first_row.find_all(['td', 'th'])
-                        for cell in cells:
-                            data_stat = cell.get('data-stat', 'No data-stat')
-                            text = cell.text.strip()
-                            f.write(f"  - {data_stat}: {text}\n")
-                    f.write("\n")
-
-                # Data Attributes Analysis
-                f.write("=== DATA ATTRIBUTES ANALYSIS ===\n")
-                elements_with_data = soup.find_all(attrs={'data-stat': True})
-                data_stats = {}
-                for elem in elements_with_data:
-                    stat = elem.get('data-stat')
-                    if stat not in data_stats:
-                        data_stats[stat] = {
-                            'count': 0,
-                            'sample': elem.text.strip()[:50]
-                        }
-                    data_stats[stat]['count'] += 1
-
-                for stat, info in sorted(data_stats.items()):
-                    f.write(f"data-stat: {stat}\n")
-                    f.write(f"  Count: {info['count']}\n")
-                    f.write(f"  Sample: {info['sample']}\n")
-
-            logger.info(f"Analysis completed and saved to: {debug_file}")
+            buf = io.StringIO()
+
+            # Basic Information
+            buf.write(f"=== PAGE ANALYSIS ===\n")
+            buf.write(f"URL: {url}\n")
+            buf.write(f"Timestamp: {timestamp}\n")
+            buf.write(f"Content Type: {content_type}\n\n")
+
+            # Page Title and Meta
+            buf.write("=== PAGE METADATA ===\n")
+            title = soup.find('title')
+            buf.write(f"Title: {title.text if title else 'No title found'}\n")
+            meta_desc = soup.find('meta', attrs={'name': 'description'})
+            buf.write(f"Description: {meta_desc['content'] if meta_desc else 'No description found'}\n\n")
+
+            # Table Analysis (data-stat attributes are collected in the same pass)
+            buf.write("=== TABLE ANALYSIS ===\n")
+            data_stats = {}
+            for idx, table in enumerate(soup.find_all('table'), 1):
+                buf.write(f"\nTable #{idx}\n")
+                buf.write(f"ID: {table.get('id', 'No ID')}\n")
+                buf.write(f"Class: {' '.join(table.get('class', []))}\n")
+
+                cells = table.find_all(['th', 'td'])
+                for cell in cells:
+                    stat = cell.get('data-stat')
+                    if stat:
+                        if stat not in data_stats:
+                            data_stats[stat] = {
+                                'count': 0,
+                                'sample': cell.text.strip()[:50]
+                            }
+                        data_stats[stat]['count'] += 1
+
+                # Analyze headers
+                headers = [cell for cell in cells if cell.name == 'th']
+                if headers:
+                    buf.write("Headers:\n")
+                    for header in headers:
+                        data_stat = header.get('data-stat', 'No data-stat')
+                        text = header.text.strip()
+                        buf.write(f"  - {text} (data-stat: {data_stat})\n")
+
+                # Sample first row data
+                first_row = table.find('tr', class_=lambda x: x != 'thead')
+                if first_row:
+                    buf.write("Sample Row Data:\n")
+                    for cell in first_row.find_all(['td', 'th']):
+                        data_stat = cell.get('data-stat', 'No data-stat')
+                        text = cell.text.strip()
+                        buf.write(f"  - {data_stat}: {text}\n")
+                buf.write("\n")
+
+            # Data Attributes Analysis
+            buf.write("=== DATA ATTRIBUTES ANALYSIS ===\n")
+            for stat, info in sorted(data_stats.items()):
+                buf.write(f"data-stat: {stat}\n")
+                buf.write(f"  Count: {info['count']}\n")
+                buf.write(f"  Sample: {info['sample']}\n")
+
+            debug_file.write_text(buf.getvalue(), encoding='utf-8')
+
+            logger.info("Analysis completed and saved to: %s", debug_file)
             return debug_file
 
         except Exception as e:
-            logger.error(f"Error analyzing page: {str(e)}", exc_info=True)
+            logger.error("Error analyzing page: %s", e, exc_info=True)
             return None
 
-    def take_screenshot(self, driver: WebDriver, reason: str) -> Optional[str]:
+    def take_screenshot(self, driver: 'WebDriver', reason: str) -> Optional[str]:
         """
         Take a screenshot of the current page state
         
@@ -175,14 +185,14 @@ class HTMLAnalyzer:
             driver.set_window_size(1920, total_height)
             
             driver.save_screenshot(str(filepath))
-            logger.info(f"Screenshot saved: {filepath}")
+            logger.info("Screenshot saved: %s", filepath)
             
             # Reset window size
             driver.set_window_size(1920, 1080)
             return str(filepath)
             
         except Exception as e:
-            logger.error(f"Failed to take screenshot: {str(e)}", exc_info=True)
+            logger.error("Failed to take screenshot: %s", e, exc_info=True)
             return None
 
     def cleanup_files(self, max_files: int = 5) -> None:
@@ -205,12 +215,12 @@ class HTMLAnalyzer:
                 # Remove old files
                 for file in files[max_files:]:
                     file.unlink()
-                    logger.debug(f"Removed old debug file: {file}")
+                    logger.debug("Removed old debug file: %s", file)
 
-            logger.info(f"Cleanup completed. Keeping {max_files} most recent files of each type.")
+            logger.info("Cleanup completed. Keeping %d most recent files of each type.", max_files)
 
         except Exception as e:
-            logger.error(f"Error during cleanup: {str(e)}", exc_info=True)
+            logger.error("Error during cleanup: %s", e, exc_info=True)
 
 if __name__ == "__main__":
     analyzer = HTMLAnalyzer()
@@ -4,12 +4,6 @@ Script to run all tests for the football analysis application.
 """
 import unittest
 import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = str(Path(__file__).resolve().parent)
-if project_root not in sys.path:
-    sys.path.append(project_root)
 
 
 def run_tests():
@@ -36,14 +36,32 @@ PREMIER_LEAGUE_URL = f"{FBREF_BASE_URL}/en/comps/9/Premier-League-Stats"
 # Scraping settings
 RETRY_COUNT = 3
 PAGE_LOAD_TIMEOUT = 30
+ELEMENT_WAIT_TIMEOUT = 10  # Seconds to wait for a required element after page load
 REQUEST_TIMEOUT = 30
 EXPONENTIAL_BACKOFF_BASE = 2
+USE_HTTP_FETCH = True  # Fetch static HTML directly, only render with WebDriver as a fallback
+MAX_CONCURRENT_REQUESTS = 4  # Team pages fetched in parallel (still bound by the rate limiter)
+PARSE_PROCESSES = 1  # Processes parsing fetched team pages (1 = parse in the fetching threads)
+
+# Page cache settings
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_DIR = DATA_DIR / 'cache' / 'pages'
+PAGE_CACHE_COMPRESSION_LEVEL = 3
+PAGE_CACHE_TTL = 6 * 60 * 60  # Seconds a cached page is served without revalidating it (0 = always revalidate)
+PAGE_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # Seconds since its last fetch after which a cached page is pruned
+PARSED_PAGE_TTL = 300  # Seconds a parsed page is reused in-process by the same service
+PARSED_PAGE_CACHE_SIZE = 8  # Parsed pages a service keeps in memory at most
+PARSED_CACHE_MAX_AGE = 7 * 24 * 60 * 60  # Seconds since last use after which a cached parse result is pruned
 
 # Rate limiting settings
 RATE_LIMIT_REQUESTS = 10  # Number of requests
 RATE_LIMIT_PERIOD = 60    # Time period in seconds
+RATE_LIMITS = {}  # Per-domain (requests, period) overrides, e.g. {'fbref': (10, 60)}
 
 # WebDriver settings
+WEBDRIVER_POOL_SIZE = MAX_CONCURRENT_REQUESTS  # Each fetch thread keeps the WebDriver it checks out
+DRIVER_CREATE_RETRIES = 3  # Attempts to start a WebDriver before giving up
+WEBDRIVER_MIN_IDLE = 0  # Idle WebDrivers started ahead of demand in the background (0 = start on demand only)
 WEBDRIVER_SETTINGS = {
     'headless': False,  # Set to True for production
     'no_sandbox': True,
@@ -53,6 +71,8 @@ WEBDRIVER_SETTINGS = {
     'disable_notifications': True,
     'disable_popup_blocking': True,
     'window_size': (1920, 1080),
+    'disable_images': True,  # Tables are all we read, skip image and stylesheet downloads
+    'disable_stylesheets': True,
     'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
     'stealth_settings': {
         'languages': ["en-US", "en"],
@@ -77,6 +97,10 @@ LOGGING_CONFIG = {
 # Teams to analyze (empty list means all teams)
 TEAMS_TO_ANALYZE = []  # Empty list means all teams
 
+# Saved data settings
+SAVE_COMPRESSED_JSON = False  # Save data files as zstd-compressed .json.zst
+JSON_COMPRESSION_LEVEL = 3
+
 # File retention settings
 FILE_RETENTION_DAYS = 30  # Number of days to keep files before cleanup
 
@@ -108,18 +132,18 @@ class Config:
             try:
                 with open(self._config_file, 'r') as f:
                     self._config_data = json.load(f)
-                    logging.info(f"Loaded configuration from {self._config_file}")
+                    logging.info("Loaded configuration from %s", self._config_file)
             except Exception as e:
-                logging.error(f"Error loading configuration: {str(e)}")
+                logging.error("Error loading configuration: %s", e)
     
     def save_config(self):
         """Save current configuration to file."""
         try:
             with open(self._config_file, 'w') as f:
                 json.dump(self._config_data, f, indent=2)
-                logging.info(f"Saved configuration to {self._config_file}")
+                logging.info("Saved configuration to %s", self._config_file)
         except Exception as e:
-            logging.error(f"Error saving configuration: {str(e)}")
+            logging.error("Error saving configuration: %s", e)
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -1,4 +1,5 @@
 import os
+import re
 import json
 import pandas as pd
 import numpy as np
@@ -6,6 +7,16 @@ from typing import Dict, List, Optional, Union
 from datetime import datetime
 import logging
 
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -13,6 +24,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Player stats tables and the column prefix each is flattened under
+STAT_TABLE_PREFIXES = [
+    ('stats', 'stat_'),
+    ('defense_stats', 'defense_'),
+    ('possession_stats', 'possession_'),
+    ('goal_creation_stats', 'creation_'),
+]
+
+# Numeric stat value with optional sign, thousands separators and percent sign
+NUMERIC_STAT = re.compile(r'^([+-]?(?:\d[\d,]*(?:\.\d*)?|\.\d+))(%)?$')
+
+# Player attributes that are taken from the standard stats table rather than flattened
+PLAYER_INFO_STATS = frozenset({'player', 'nationality', 'position', 'age'})
+
+# Match columns holding raw stat values that are converted to floats
+MATCH_STAT_COLUMNS = ['goals_for', 'goals_against', 'xg_for', 'xg_against', 'possession', 'attendance']
+
+# Format of match dates in the FBref match logs
+MATCH_DATE_FORMAT = '%Y-%m-%d'
+
 class DataProcessor:
     def __init__(self, data_dir: str):
         """
@@ -30,35 +61,46 @@ class DataProcessor:
         """Load teams info from teams_YYYYMMDD.json"""
         teams_info = {}
         for filename in os.listdir(self.teams_dir):
-            if filename.startswith('teams_') and filename.endswith('.json'):
+            if filename.startswith('teams_') and self._is_json_file(filename):
                 file_path = os.path.join(self.teams_dir, filename)
-                with open(file_path, 'r') as f:
-                    teams_data = json.load(f)
-                    for team in teams_data:
-                        team_id = team['url'].split('/')[-2].split('-')[0]
-                        teams_info[team_id] = team['name']
+                teams_data = self._read_json(file_path)
+                for team in teams_data:
+                    team_id = team['url'].rpartition('/')[0].rpartition('/')[2].partition('-')[0]
+                    teams_info[team_id] = team['name']
         return teams_info
     
     def load_team_data(self) -> Dict:
         """Load all individual team data from JSON files"""
         team_data = {}
         for filename in os.listdir(self.teams_dir):
-            if '_202' in filename and filename.endswith('.json'):  # Match pattern like 822bd0ba_20250109.json
+            if '_202' in filename and self._is_json_file(filename):  # Match pattern like 822bd0ba_20250109.json
                 file_path = os.path.join(self.teams_dir, filename)
-                with open(file_path, 'r') as f:
-                    team_data[filename] = json.load(f)
+                team_data[filename] = self._read_json(file_path)
         return team_data
     
     def load_standings_data(self) -> Dict:
         """Load all standings data from JSON files"""
         standings_data = {}
         for filename in os.listdir(self.standings_dir):
-            if filename.endswith('.json'):
+            if self._is_json_file(filename):
                 file_path = os.path.join(self.standings_dir, filename)
-                with open(file_path, 'r') as f:
-                    standings_data[filename] = json.load(f)
+                standings_data[filename] = self._read_json(file_path)
         return standings_data
     
+    def _is_json_file(self, filename: str) -> bool:
+        """Check if a file is a plain or zstd-compressed JSON data file"""
+        return filename.endswith('.json') or (zstd is not None and filename.endswith('.json.zst'))
+    
+    def _read_json(self, file_path: str):
+        """Read a plain or zstd-compressed JSON file in a single read, parsing it with orjson when installed"""
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if file_path.endswith('.zst'):
+            data = zstd.ZstdDecompressor().decompress(data)
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    
     def process_player_stats(self, team_data: Dict) -> pd.DataFrame:
         """
         Process player statistics into a DataFrame
@@ -92,35 +134,25 @@ class DataProcessor:
                         'nationality': stats.get('nationality', '').split()[-1] if stats.get('nationality') else '',
                         'age': self._convert_age(stats.get('age', '')),
                     })
-                    
-                    for key, value in stats.items():
-                        if key not in ['player', 'nationality', 'position', 'age']:
-                            player_dict[f'stat_{key}'] = self._convert_stat(value)
-                
-                # Add defensive stats if available
-                defense_stats = player_info.get('defense_stats', {})
-                if defense_stats:
-                    for key, value in defense_stats.items():
-                        if key not in ['player', 'nationality', 'position', 'age']:
-                            player_dict[f'defense_{key}'] = self._convert_stat(value)
                 
-                # Add possession stats if available
-                possession_stats = player_info.get('possession_stats', {})
-                if possession_stats:
-                    for key, value in possession_stats.items():
-                        if key not in ['player', 'nationality', 'position', 'age']:
-                            player_dict[f'possession_{key}'] = self._convert_stat(value)
-                
-                # Add goal creation stats if available
-                goal_creation_stats = player_info.get('goal_creation_stats', {})
-                if goal_creation_stats:
-                    for key, value in goal_creation_stats.items():
-                        if key not in ['player', 'nationality', 'position', 'age']:
-                            player_dict[f'creation_{key}'] = self._convert_stat(value)
+                # Flatten each stats table into prefixed columns
+                for stats_key, prefix in STAT_TABLE_PREFIXES:
+                    table_stats = player_info.get(stats_key)
+                    if table_stats:
+                        player_dict.update((f'{prefix}{key}', value) for key, value in table_stats.items()
+                                           if key not in PLAYER_INFO_STATS)
                 
                 all_players.append(player_dict)
         
-        return pd.DataFrame(all_players)
+        # Convert all raw stat values in a single vectorized pass
+        players_df = pd.DataFrame(all_players)
+        stat_prefixes = tuple(prefix for _, prefix in STAT_TABLE_PREFIXES)
+        stat_columns = [column for column in players_df.columns if column.startswith(stat_prefixes)]
+        if stat_columns:
+            raw_values = pd.Series(players_df[stat_columns].to_numpy().ravel())
+            players_df[stat_columns] = self._convert_stat_series(
+                raw_values).to_numpy().reshape(len(players_df), len(stat_columns))
+        return players_df
     
     def process_team_matches(self, team_data: Dict) -> pd.DataFrame:
         """
@@ -147,22 +179,27 @@ class DataProcessor:
                     'round': match.get('round', ''),
                     'venue': match.get('venue', ''),
                     'result': match.get('result', ''),
-                    'goals_for': self._convert_stat(match.get('goals_for', 0)),
-                    'goals_against': self._convert_stat(match.get('goals_against', 0)),
+                    'goals_for': match.get('goals_for', 0),
+                    'goals_against': match.get('goals_against', 0),
                     'opponent': match.get('opponent', ''),
                     'opponent_id': match.get('opponent_id', ''),
-                    'xg_for': self._convert_stat(match.get('xg_for', 0)),
-                    'xg_against': self._convert_stat(match.get('xg_against', 0)),
-                    'possession': self._convert_stat(match.get('possession', 0)),
-                    'attendance': self._convert_stat(match.get('attendance', 0)),
+                    'xg_for': match.get('xg_for', 0),
+                    'xg_against': match.get('xg_against', 0),
+                    'possession': match.get('possession', 0),
+                    'attendance': match.get('attendance', 0),
                     'captain': match.get('captain', ''),
                     'formation': match.get('formation', ''),
                     'referee': match.get('referee', '')
                 }
                 all_matches.append(match_dict)
         
+        # Convert all raw stat values and dates in a single vectorized pass each
         matches_df = pd.DataFrame(all_matches)
-        matches_df['date'] = pd.to_datetime(matches_df['date'])
+        if len(matches_df):
+            raw_values = pd.Series(matches_df[MATCH_STAT_COLUMNS].to_numpy().ravel())
+            matches_df[MATCH_STAT_COLUMNS] = self._convert_stat_series(
+                raw_values).to_numpy().reshape(len(matches_df), len(MATCH_STAT_COLUMNS))
+            matches_df['date'] = pd.to_datetime(matches_df['date'], format=MATCH_DATE_FORMAT)
         return matches_df
     
     def process_standings(self, standings_data: Dict) -> pd.DataFrame:
@@ -267,7 +304,7 @@ class DataProcessor:
         
         output_path = os.path.join(output_dir, f"{filename}.csv")
         data.to_csv(output_path, index=False)
-        logger.info(f"Saved processed data to {output_path}")
+        logger.info("Saved processed data to %s", output_path)
     
     def _convert_age(self, age_str: str) -> float:
         """Convert age string (e.g., '24-075') to float years"""
@@ -285,14 +322,20 @@ class DataProcessor:
             return None
         if isinstance(value, (int, float)):
             return float(value)
-        try:
-            # Remove commas and convert percentages
-            value = str(value).replace(',', '')
-            if value.endswith('%'):
-                return float(value.rstrip('%')) / 100
-            return float(value)
-        except:
+        match = NUMERIC_STAT.match(str(value))
+        if not match:
             return None
+        # Remove commas and convert percentages
+        number = float(match.group(1).replace(',', ''))
+        return number / 100 if match.group(2) else number
+
+    def _convert_stat_series(self, values: pd.Series) -> pd.Series:
+        """Vectorized _convert_stat over a series of raw stat values"""
+        # Stat values repeat heavily ('0', '', '1', ...), so only the distinct
+        # values are converted and the results are broadcast back
+        codes, uniques = pd.factorize(values)
+        converted = np.array([self._convert_stat(value) for value in uniques] + [None], dtype=float)
+        return pd.Series(converted[codes], index=values.index)
 
 def main():
     """Main function to process all data"""
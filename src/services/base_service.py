@@ -2,17 +2,84 @@
 Base service class that provides common functionality for all services
 """
 import logging
-from typing import Dict, Any, Optional, List, Union
+import re
+import threading
+import time
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
 
 # Use absolute imports for better compatibility
 from src.config import get_config
 from src.utils.webdriver_pool import get_webdriver_pool
 from src.utils.rate_limiter import get_rate_limiter
+from src.utils.page_cache import get_page_cache
 from src.utils.file_manager import FileManager
 
 logger = logging.getLogger(__name__)
 
+# HTML comments; FBRef wraps its secondary stat tables in them
+HTML_COMMENT = re.compile(r'<!--(.*?)-->', re.DOTALL)
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Per-thread lxml HTML parser (a parser must not be used by several threads at once)
+_parser_local = threading.local()
+
+
+def get_html_parser() -> lxml.html.HTMLParser:
+    """
+    Get this thread's reusable lxml HTML parser.
+
+    Tables are looked up by XPath, so the parser skips building lxml's
+    internal id index.
+
+    Returns:
+        HTMLParser: The parser instance
+    """
+    parser = getattr(_parser_local, 'parser', None)
+    if parser is None:
+        parser = _parser_local.parser = lxml.html.HTMLParser(collect_ids=False)
+    return parser
+
+
+# Marks the fetch worker threads that keep their WebDriver between fetches
+_driver_keepers = threading.local()
+
+
+def keep_thread_driver() -> None:
+    """
+    Let the calling thread keep the WebDriver it checks out between fetches.
+
+    Meant as the initializer of fetch worker threads, whose driver returns to
+    the pool when the thread exits. Every other thread hands its driver back
+    after each fetch, so a thread that only renders the odd page (such as the
+    main thread) does not pin one of the pool's drivers.
+    """
+    _driver_keepers.keep = True
+
+
+def _uncomment_tables(page_source: str) -> str:
+    """
+    Unwrap the HTML comments that hide stat tables.
+
+    Other comments are left alone, so commented-out scripts and markup
+    do not leak into the parsed page.
+
+    Args:
+        page_source: Page content
+
+    Returns:
+        str: Page content with commented-out tables exposed
+    """
+    return HTML_COMMENT.sub(
+        lambda match: match.group(1) if '<table' in match.group(1) else match.group(0),
+        page_source)
+
 
 class BaseService:
     """Base service class with common functionality."""
@@ -22,7 +89,63 @@ class BaseService:
         self.config = get_config()
         self.webdriver_pool = get_webdriver_pool()
         self.rate_limiter = get_rate_limiter()
+        self.page_cache = get_page_cache()
         self.file_manager = FileManager()
+        self.fbref_base_url = self.config.get('fbref_base_url')
+        self.session = self._create_session()
+
+        # Parsed pages by URL in the order they were parsed, with the monotonic
+        # time they were parsed at
+        self._parsed_pages: Dict[str, Tuple[float, lxml.html.HtmlElement]] = {}
+        self._parsed_page_locks: Dict[str, threading.Lock] = {}
+        self._parsed_pages_lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create the HTTP session used for static page fetches.
+
+        Reusing one session keeps connections to FBRef alive between requests
+        instead of paying a new TCP and TLS handshake for every page. The
+        connection pool is sized for concurrent fetches, and throttled or
+        failed requests are retried with exponential backoff (honouring
+        Retry-After) before falling back to the WebDriver.
+
+        Returns:
+            requests.Session: Configured HTTP session
+        """
+        session = requests.Session()
+        session.headers.update({
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        user_agent = self.config.get('webdriver_settings', {}).get('user_agent', '')
+        if user_agent:
+            session.headers['User-Agent'] = user_agent
+
+        retries = Retry(
+            total=self.config.get('retry_count', 3),
+            backoff_factor=1,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=['GET'],
+            raise_on_status=False)
+        adapter = HTTPAdapter(
+            pool_maxsize=max(10, self.config.get('max_concurrent_requests', 4)),
+            max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self) -> None:
+        """Close the HTTP session and release its pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> 'BaseService':
+        """Use the service as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the service when leaving the context."""
+        self.close()
 
     def get_timestamp(self, format_str: str = '%Y%m%d') -> str:
         """
@@ -56,13 +179,13 @@ class BaseService:
                     return True
                 if attempt < max_retries - 1:
                     logger.warning(
-                        f"Retrying save attempt {attempt + 1} of {max_retries}")
+                        "Retrying save attempt %d of %d", attempt + 1, max_retries)
             except Exception as e:
                 if attempt < max_retries - 1:
                     logger.warning(
-                        f"Save attempt {attempt + 1} failed: {str(e)}. Retrying...")
+                        "Save attempt %d failed: %s. Retrying...", attempt + 1, e)
                 else:
-                    logger.error(f"All save attempts failed for {filename}")
+                    logger.error("All save attempts failed for %s", filename)
         return False
 
     def load_data(self, filename: str, category: str) -> Optional[Dict[str, Any]]:
@@ -79,45 +202,254 @@ class BaseService:
         try:
             return self.file_manager.load_data(filename, category)
         except Exception as e:
-            logger.error(f"Error loading data from {filename}: {str(e)}")
+            logger.error("Error loading data from %s: %s", filename, e)
             return None
 
-    def get_page_with_rate_limit(self, url: str, domain: str = "default") -> Optional[str]:
+    def get_page_with_rate_limit(self, url: str, domain: str = "default",
+                                 required_id: Optional[str] = None,
+                                 bypass_cache: bool = False) -> Optional[str]:
         """
         Get a web page with rate limiting.
 
+        Pages fetched within the page cache TTL that contain the required
+        element are served from the page cache without touching the rate
+        limiter or the WebDriver pool. Otherwise the server-rendered HTML is
+        fetched with a plain HTTP request (conditional on the cached ETag and
+        Last-Modified date, if any), and the page is only rendered with a
+        WebDriver if that fails or the required element is missing from the
+        static HTML.
+
         Args:
             url: URL to fetch
             domain: Domain for rate limiting
+            required_id: ID of an element the page must contain (e.g. a table id)
+            bypass_cache: Fetch the page even if a fresh copy is cached (it is
+                still revalidated with a conditional request where possible)
 
         Returns:
             str: Page content or None if fetching failed
         """
+        if not bypass_cache:
+            cached_page = self.page_cache.get(url)
+            if cached_page:
+                if not required_id or f'id="{required_id}"' in cached_page:
+                    return cached_page
+                logger.info("%s not found in cached copy of %s, fetching it again", required_id, url)
+
+        page_source = None
+        validators = {}
+        if self.config.get('use_http_fetch', True):
+            page_source, validators = self._fetch_html(url, domain)
+            if page_source and required_id and f'id="{required_id}"' not in page_source:
+                logger.info(
+                    "%s not found in static HTML of %s, falling back to WebDriver", required_id, url)
+                page_source = None
+                validators = {}
+
+        if not page_source:
+            page_source = self._fetch_with_webdriver(url, domain, required_id)
+
+        if page_source:
+            self.page_cache.set(url, page_source, **validators)
+        return page_source
+
+    def get_parsed_page(self, url: str, domain: str = "default", required_id: Optional[str] = None,
+                        ttl: Optional[float] = None) -> Optional[lxml.html.HtmlElement]:
+        """
+        Get a web page parsed into an lxml tree.
+
+        Services that read several tables from the same page reuse the tree
+        parsed within the last ttl seconds instead of fetching and parsing the
+        page again. Concurrent callers for the same URL wait for the first
+        one's result. A cached tree without the required element is refetched.
+        Expired trees are dropped whenever a page is parsed, and at most
+        parsed_page_cache_size trees are kept.
+
+        Args:
+            url: URL to fetch
+            domain: Domain for rate limiting
+            required_id: ID of an element the page must contain (e.g. a table id)
+            ttl: Seconds a parsed page is reused (defaults to parsed_page_ttl)
+
+        Returns:
+            HtmlElement: Root of the parsed page or None if fetching failed
+        """
+        if ttl is None:
+            ttl = self.config.get('parsed_page_ttl', 300)
+
+        with self._parsed_pages_lock:
+            url_lock = self._parsed_page_locks.setdefault(url, threading.Lock())
+
+        with url_lock:
+            cached = self._parsed_pages.get(url)
+            if cached and time.monotonic() - cached[0] < ttl:
+                root = cached[1]
+                if not required_id or root.get_element_by_id(required_id, None) is not None:
+                    logger.debug("Reusing parsed page %s", url)
+                    return root
+
+            page_source = self.get_page_with_rate_limit(url, domain, required_id)
+            if not page_source:
+                return None
+
+            root = lxml.html.fromstring(page_source, parser=get_html_parser())
+            self._store_parsed_page(url, root, ttl)
+            return root
+
+    def _store_parsed_page(self, url: str, root: lxml.html.HtmlElement, ttl: float) -> None:
+        """
+        Keep a parsed page for reuse, dropping expired pages and the oldest pages over the size limit.
+
+        Args:
+            url: URL of the page
+            root: Root of the parsed page
+            ttl: Seconds a parsed page is reused
+        """
+        max_pages = max(1, self.config.get('parsed_page_cache_size', 8))
+        now = time.monotonic()
+        with self._parsed_pages_lock:
+            self._parsed_pages.pop(url, None)
+            self._parsed_pages[url] = (now, root)
+
+            # Pages are in parse order, so expired and excess pages are at the front
+            while len(self._parsed_pages) > 1 and (
+                    len(self._parsed_pages) > max_pages or
+                    now - next(iter(self._parsed_pages.values()))[0] >= ttl):
+                evicted = next(iter(self._parsed_pages))
+                del self._parsed_pages[evicted]
+                url_lock = self._parsed_page_locks.get(evicted)
+                if url_lock is not None and not url_lock.locked():
+                    del self._parsed_page_locks[evicted]
+
+    def _fetch_html(self, url: str, domain: str = "default") -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Fetch the server-rendered HTML of a page without a browser.
+
+        FBRef ships most secondary stat tables inside HTML comments that are only
+        unwrapped by JavaScript, so those comments are removed to expose them.
+        If the page is cached with an ETag or Last-Modified date the request is
+        made conditional (If-None-Match / If-Modified-Since), and a 304 response
+        is answered from the cache without downloading the body.
+
+        Args:
+            url: URL to fetch
+            domain: Domain for rate limiting
+
+        Returns:
+            tuple: Page content (None if fetching failed) and the page's cache
+                validators ('etag' and 'last_modified', empty if fetching failed)
+        """
+        cache_entry = self.page_cache.get_entry(url) or {}
+        headers = {}
+        if cache_entry.get('etag'):
+            headers['If-None-Match'] = cache_entry['etag']
+        if cache_entry.get('last_modified'):
+            headers['If-Modified-Since'] = cache_entry['last_modified']
+
+        # Wait if needed to respect rate limits
+        self.rate_limiter.wait_if_needed(domain)
+
+        try:
+            logger.info("Fetching %s", url)
+            response = self.session.get(
+                url,
+                headers=headers or None,
+                timeout=self.config.get('request_timeout', 30))
+
+            if response.status_code == 304:
+                page_source = self.page_cache.load(url, cache_entry)
+                if page_source:
+                    logger.info("%s not modified since last fetch", url)
+                    return page_source, {
+                        'etag': cache_entry.get('etag'),
+                        'last_modified': cache_entry.get('last_modified')
+                    }
+
+            response.raise_for_status()
+            return _uncomment_tables(response.text), {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
+
+        except Exception as e:
+            logger.warning("Error fetching page %s: %s", url, e)
+            return None, {}
+
+    def _fetch_with_webdriver(self, url: str, domain: str = "default",
+                              required_id: Optional[str] = None) -> Optional[str]:
+        """
+        Fetch a page by rendering it with a pooled WebDriver.
+
+        If a required element is given, the page source is only read once that
+        element is present (looked up by ID, the cheapest locator), since it may
+        be rendered by JavaScript after the page load completes. All other tables
+        are parsed from the page source, so no further waits are needed.
+
+        Fetch worker threads (see keep_thread_driver) keep the driver they check
+        out for their lifetime, so a worker rendering several pages skips the
+        pool and the driver reset between them. Other threads, and any thread
+        whose fetch fails, hand the driver back to the pool after the fetch.
+
+        Args:
+            url: URL to fetch
+            domain: Domain for rate limiting
+            required_id: ID of an element to wait for before reading the page
+
+        Returns:
+            str: Page content or None if fetching failed or the required
+                element never appeared
+        """
         # Wait if needed to respect rate limits
         self.rate_limiter.wait_if_needed(domain)
 
-        # Get a WebDriver from the pool
-        driver = self.webdriver_pool.get_driver()
+        # Get this thread's WebDriver
+        driver = self.webdriver_pool.get_thread_driver()
         if not driver:
             logger.error("Could not get WebDriver from pool")
             return None
 
+        keep_driver = getattr(_driver_keepers, 'keep', False)
         try:
             # Navigate to the URL
-            logger.info(f"Navigating to {url}")
+            logger.info("Navigating to %s", url)
             driver.get(url)
 
-            # Record the request for rate limiting
-            self.rate_limiter.record_request(domain)
-
-            # Get the page source
-            page_source = driver.page_source
-            return page_source
+            if required_id and not self._wait_for_element_id(driver, required_id):
+                # Without the element the page is incomplete, so it must not be cached
+                page_source = None
+            else:
+                page_source = driver.page_source
 
         except Exception as e:
-            logger.error(f"Error fetching page {url}: {str(e)}")
-            return None
+            logger.error("Error fetching page %s: %s", url, e)
+            page_source = None
+            keep_driver = False
+
+        if not keep_driver:
+            # Hand the driver back; it is reset before another thread reuses it
+            self.webdriver_pool.release_thread_driver()
+        return page_source
 
-        finally:
-            # Release the WebDriver back to the pool
-            self.webdriver_pool.release_driver(driver)
+    def _wait_for_element_id(self, driver, element_id: str) -> bool:
+        """
+        Wait until an element with the given ID is present on the page.
+
+        Args:
+            driver: WebDriver that has loaded the page
+            element_id: ID of the element to wait for
+
+        Returns:
+            bool: True if the element is present, False if the wait timed out
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        try:
+            WebDriverWait(driver, self.config.get('element_wait_timeout', 10)).until(
+                EC.presence_of_element_located((By.ID, element_id)))
+            return True
+        except TimeoutException:
+            logger.warning("Element %s not found on %s", element_id, driver.current_url)
+            return False
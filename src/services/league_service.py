@@ -2,8 +2,11 @@
 League service for handling league-related operations
 """
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Union
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from datetime import datetime
 
 from .base_service import BaseService
@@ -11,6 +14,25 @@ from src.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Integer or decimal stat value, optionally signed and with thousands separators
+NUMERIC_VALUE = re.compile(r'^[+-]?\d[\d,]*(?:\.\d+)?$')
+
+# League table and squad standard stats table on the league page
+STANDINGS_TABLE_ID = 'results2024-202591_overall'
+TEAM_STATS_TABLE_ID = 'stats_squads_standard_for'
+
+# Table with the given id ($table_id)
+TABLE_BY_ID = etree.XPath('//table[@id=$table_id]')
+
+# Body rows of a table
+BODY_ROWS = etree.XPath('tbody/tr')
+
+# Cells of a table row that carry a data-stat name
+STAT_CELLS = etree.XPath("./td[@data-stat!='']|./th[@data-stat!='']")
+
+# Href of the team link in a standings row ('' if there is none)
+TEAM_LINK = etree.XPath("string(td[@data-stat='team']/a/@href)", smart_strings=False)
+
 
 class LeagueService(BaseService):
     """Service for handling league-related operations."""
@@ -30,33 +52,23 @@ class LeagueService(BaseService):
         logger.info("Fetching Premier League standings...")
 
         try:
-            page_source = self.get_page_with_rate_limit(
-                self.base_url, domain="fbref")
-            if not page_source:
+            root = self.get_parsed_page(
+                self.base_url, domain="fbref", required_id=STANDINGS_TABLE_ID)
+            if root is None:
                 logger.error("Failed to load Premier League standings page")
                 return None
 
-            soup = BeautifulSoup(page_source, 'html.parser')
-
             # Find the standings table
-            standings_table = soup.find(
-                'table', {'id': 'results2024-202591_overall'})
+            standings_table = TABLE_BY_ID(root, table_id=STANDINGS_TABLE_ID)
             if not standings_table:
                 logger.error("Could not find standings table")
                 return None
 
             standings = []
-            team_rows = standings_table.find('tbody').find_all('tr')
+            team_rows = BODY_ROWS(standings_table[0])
 
             for row in team_rows:
-                team_data = {}
-
-                # Get all cells in the row
-                for cell in row.find_all(['td', 'th']):
-                    stat_name = cell.get('data-stat')
-                    if stat_name:
-                        team_data[stat_name] = cell.text.strip()
-
+                team_data = self._extract_row_data(row)
                 if team_data:
                     # Add rank if not present
                     if 'rank' not in team_data and len(standings) + 1 <= 20:
@@ -75,19 +87,19 @@ class LeagueService(BaseService):
                     team_data['goal_diff'] = team_data.get('goal_diff', '0')
 
                     # Extract team URL if available
-                    team_cell = row.find('td', {'data-stat': 'team'})
-                    if team_cell and team_cell.find('a'):
-                        team_url = f"{self.config.get('fbref_base_url')}{team_cell.find('a')['href']}"
+                    if team_link := TEAM_LINK(row):
+                        team_url = f"{self.fbref_base_url}{team_link}"
                         team_data['url'] = team_url
-                        team_data['team_id'] = team_url.split('/')[-2]
+                        team_data['team_id'] = team_url.rpartition('/')[0].rpartition('/')[2]
 
                     standings.append(team_data)
-                    logger.info(
-                        f"Found team: {team_data['team']} - {team_data['points']} pts")
 
             if standings:
                 logger.info(
-                    f"Successfully found {len(standings)} teams in standings")
+                    "Parsed %d teams in standings from %s", len(standings), self.base_url)
+                if logger.isEnabledFor(logging.DEBUG):
+                    for team_data in standings:
+                        logger.debug("team=%s pts=%s", team_data['team'], team_data['points'])
 
                 # Save standings data
                 timestamp = self.get_timestamp()
@@ -104,7 +116,7 @@ class LeagueService(BaseService):
 
         except Exception as e:
             logger.error(
-                f"Error fetching league standings: {str(e)}", exc_info=True)
+                "Error fetching league standings: %s", e, exc_info=True)
             return None
 
     def get_team_stats(self) -> Optional[List[Dict[str, Union[str, float, int]]]]:
@@ -117,33 +129,23 @@ class LeagueService(BaseService):
         logger.info("Fetching team statistics...")
 
         try:
-            page_source = self.get_page_with_rate_limit(
-                self.base_url, domain="fbref")
-            if not page_source:
+            root = self.get_parsed_page(
+                self.base_url, domain="fbref", required_id=TEAM_STATS_TABLE_ID)
+            if root is None:
                 logger.error("Failed to load team statistics page")
                 return None
 
-            soup = BeautifulSoup(page_source, 'html.parser')
-
             # Find the statistics table
-            stats_table = soup.find(
-                'table', {'id': 'stats_squads_standard_for'})
+            stats_table = TABLE_BY_ID(root, table_id=TEAM_STATS_TABLE_ID)
             if not stats_table:
                 logger.error("Could not find statistics table")
                 return None
 
             stats = []
-            team_rows = stats_table.find('tbody').find_all('tr')
+            team_rows = BODY_ROWS(stats_table[0])
 
             for row in team_rows:
-                team_data = {}
-
-                # Get all cells in the row
-                for cell in row.find_all(['td', 'th']):
-                    stat_name = cell.get('data-stat')
-                    if stat_name:
-                        team_data[stat_name] = cell.text.strip()
-
+                team_data = self._extract_row_data(row)
                 if team_data:
                     # Clean up stats
                     team_data['team'] = team_data.get('team', 'Unknown')
@@ -155,20 +157,16 @@ class LeagueService(BaseService):
 
                     # Convert stats to float or int if possible
                     for stat, value in team_data.items():
-                        if stat != 'team':
-                            try:
-                                team_data[stat] = float(
-                                    value) if '.' in value else int(value)
-                            except ValueError:
-                                pass
+                        if stat != 'team' and NUMERIC_VALUE.match(value):
+                            value = value.replace(',', '')
+                            team_data[stat] = float(
+                                value) if '.' in value else int(value)
 
                     stats.append(team_data)
-                    logger.info(
-                        f"Found team statistics for {team_data['team']}")
 
             if stats:
                 logger.info(
-                    f"Successfully found statistics for {len(stats)} teams")
+                    "Parsed statistics for %d teams from %s", len(stats), self.base_url)
 
                 # Save team stats data
                 timestamp = self.get_timestamp()
@@ -185,18 +183,38 @@ class LeagueService(BaseService):
 
         except Exception as e:
             logger.error(
-                f"Error fetching team statistics: {str(e)}", exc_info=True)
+                "Error fetching team statistics: %s", e, exc_info=True)
             return None
 
+    def _extract_row_data(self, row: lxml.html.HtmlElement) -> Dict[str, str]:
+        """
+        Extract the cells of a table row keyed by their data-stat attribute.
+
+        Args:
+            row: Table row element
+
+        Returns:
+            dict: Cell text by data-stat name
+        """
+        return {cell.get('data-stat'): cell.text_content().strip()
+                for cell in STAT_CELLS(row)}
+
     def get_league_summary(self) -> Dict[str, Any]:
         """
         Get a summary of the league including standings and team statistics.
 
+        Standings and team statistics are collected concurrently. Both read the
+        league page, which is fetched and parsed once (see get_parsed_page);
+        extracting and saving the two tables then overlaps.
+
         Returns:
             dict: Dictionary containing league summary
         """
-        standings = self.get_league_standings()
-        team_stats = self.get_team_stats()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            standings_future = executor.submit(self.get_league_standings)
+            team_stats_future = executor.submit(self.get_team_stats)
+            standings = standings_future.result()
+            team_stats = team_stats_future.result()
 
         return {
             'standings': standings if standings else [],
@@ -2,16 +2,36 @@
 Team service for handling team-related operations
 """
 import logging
-from typing import Dict, Any, Optional, List, Union
-from bs4 import BeautifulSoup
+from typing import Dict, Any, Optional, List, Set, Tuple, Union
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
 import json
 
 from .base_service import BaseService
+from .team_stats_service import TeamStatsService
 from src.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# League table listing every team of the season
+TEAMS_TABLE_ID = 'results2024-202591_overall'
+
+# Length of the name fragments indexed for partial team name lookups
+NAME_GRAM_SIZE = 3
+
+
+def _name_grams(name: str) -> Set[str]:
+    """
+    Get the fragments of NAME_GRAM_SIZE characters in a lowercased name.
+
+    Args:
+        name: Lowercased name
+
+    Returns:
+        set: Every fragment of the name, empty if the name is too short
+    """
+    return {name[i:i + NAME_GRAM_SIZE] for i in range(len(name) - NAME_GRAM_SIZE + 1)}
+
 
 class TeamService(BaseService):
     """Service for handling team-related operations."""
@@ -20,6 +40,59 @@ class TeamService(BaseService):
         """Initialize the team service."""
         super().__init__()
         self.base_url = self.config.get('premier_league_url')
+        self._stats_service: Optional[TeamStatsService] = None
+
+        # Lowercased team names paired with their teams, and the team list they were built from
+        self._team_index: List[Tuple[str, Dict[str, str]]] = []
+        self._team_index_source: Optional[List[Dict[str, str]]] = None
+
+        # First team with each lowercased name, and the positions in the team
+        # index of the teams whose lowercased name contains each name fragment
+        self._team_names: Dict[str, Dict[str, str]] = {}
+        self._team_grams: Dict[str, Set[int]] = {}
+
+    def close(self) -> None:
+        """Close the HTTP sessions of this service and its team stats service."""
+        if self._stats_service is not None:
+            self._stats_service.close()
+        super().close()
+
+    def _get_team_index(self, teams: List[Dict[str, str]]) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Get the teams paired with their lowercased names.
+
+        The index is rebuilt only when a different (or resized) team list is
+        passed, so repeated lookups do not lowercase every team name again.
+        The name lookups used by get_team_by_name are rebuilt with it.
+
+        Args:
+            teams: List of teams
+
+        Returns:
+            list: (lowercased name, team) pairs in the order of the team list
+        """
+        if teams is not self._team_index_source or len(teams) != len(self._team_index):
+            self._team_index = [(team['name'].lower(), team) for team in teams]
+            self._team_index_source = teams
+
+            self._team_names = {}
+            self._team_grams = {}
+            for position, (name_lower, team) in enumerate(self._team_index):
+                self._team_names.setdefault(name_lower, team)
+                for gram in _name_grams(name_lower):
+                    self._team_grams.setdefault(gram, set()).add(position)
+        return self._team_index
+
+    def _get_stats_service(self) -> TeamStatsService:
+        """
+        Get the team stats service shared by every detailed stats request.
+
+        Returns:
+            TeamStatsService: The team stats service, created on first use
+        """
+        if self._stats_service is None:
+            self._stats_service = TeamStatsService()
+        return self._stats_service
 
     def get_premier_league_teams(self) -> Optional[List[Dict[str, str]]]:
         """
@@ -28,20 +101,21 @@ class TeamService(BaseService):
         Returns:
             list: List of dictionaries containing team information or None if error occurs
         """
-        logger.info(f"Fetching Premier League teams from: {self.base_url}")
+        logger.info("Fetching Premier League teams from: %s", self.base_url)
 
         try:
             page_source = self.get_page_with_rate_limit(
-                self.base_url, domain="fbref")
+                self.base_url, domain="fbref", required_id=TEAMS_TABLE_ID)
             if not page_source:
                 logger.error("Failed to load Premier League stats page")
                 return None
 
-            soup = BeautifulSoup(page_source, 'html.parser')
+            # Only build the tree for the teams table, not the whole page
+            soup = BeautifulSoup(page_source, 'lxml',
+                                 parse_only=SoupStrainer('table', id=TEAMS_TABLE_ID))
 
             # Find the table containing team data
-            teams_table = soup.find(
-                'table', {'id': 'results2024-202591_overall'})
+            teams_table = soup.find('table', {'id': TEAMS_TABLE_ID})
             if not teams_table:
                 logger.error("Could not find teams table")
                 return None
@@ -59,20 +133,21 @@ class TeamService(BaseService):
                 if team_cell:
                     team_link = team_cell.find('a')
                     if team_link:
-                        team_name = team_link.text.strip()
-                        team_url = f"{self.config.get('fbref_base_url')}{team_link['href']}"
+                        team_name = team_link.get_text(strip=True)
+                        team_url = f"{self.fbref_base_url}{team_link['href']}"
                         # Extract team ID from URL
-                        team_id = team_url.split('/')[-2]
+                        team_id = team_url.rpartition('/')[0].rpartition('/')[2]
 
                         teams.append({
                             'name': team_name,
                             'url': team_url,
                             'id': team_id
                         })
-                        logger.info(f"Found team: {team_name}")
 
             if teams:
-                logger.info(f"Successfully found {len(teams)} teams")
+                self._get_team_index(teams)
+                logger.info("Successfully found %d teams", len(teams))
+                logger.info("Found teams: %s", ", ".join(team['name'] for team in teams))
 
                 # Save teams data
                 timestamp = self.get_timestamp()
@@ -89,7 +164,7 @@ class TeamService(BaseService):
 
         except Exception as e:
             logger.error(
-                f"Error fetching Premier League teams: {str(e)}", exc_info=True)
+                "Error fetching Premier League teams: %s", e, exc_info=True)
             return None
 
     def get_team_by_name(self, team_name: str, teams: Optional[List[Dict[str, str]]] = None) -> Optional[Dict[str, str]]:
@@ -108,13 +183,26 @@ class TeamService(BaseService):
             if not teams:
                 return None
 
-        # Case-insensitive partial match
+        # Case-insensitive exact match
         team_name_lower = team_name.lower()
-        for team in teams:
-            if team_name_lower in team['name'].lower():
+        team_index = self._get_team_index(teams)
+        team = self._team_names.get(team_name_lower)
+        if team:
+            return team
+
+        # Case-insensitive partial match, only checking the teams whose names
+        # contain every fragment of the searched name
+        grams = _name_grams(team_name_lower)
+        if grams:
+            positions = set.intersection(*(self._team_grams.get(gram, set()) for gram in grams))
+            candidates = [team_index[position] for position in sorted(positions)]
+        else:
+            candidates = team_index
+        for name_lower, team in candidates:
+            if team_name_lower in name_lower:
                 return team
 
-        logger.warning(f"Team not found: {team_name}")
+        logger.warning("Team not found: %s", team_name)
         return None
 
     def get_all_teams_detailed_stats(self, teams: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
@@ -136,44 +224,30 @@ class TeamService(BaseService):
         # Get teams to analyze from config
         teams_to_analyze = self.config.get('teams_to_analyze', [])
 
-        # If teams_to_analyze is empty, analyze all teams
-        if not teams_to_analyze:
-            teams_to_analyze = [team['name'] for team in teams]
+        # Lowercase the filters once rather than for every team they are matched against
+        team_filters = [team_filter.lower() for team_filter in teams_to_analyze]
 
         team_stats = {}
+        teams_to_fetch = []
         timestamp = self.get_timestamp()
 
-        for team in teams:
-            if any(team_filter.lower() in team['name'].lower() for team_filter in teams_to_analyze):
-                logger.info(
-                    f"\nFetching detailed statistics for team: {team['name']}")
-
-                # Check if we already have recent data for this team
-                team_id = team['id']
-                recent_file = f"{team_id}_{timestamp}.json"
-
-                # Try to load from existing file first
-                stats = self.load_data(recent_file, 'teams')
-
-                # If not found, fetch new data
-                if not stats:
-                    from .team_stats_service import TeamStatsService
-                    team_stats_service = TeamStatsService()
-                    stats = team_stats_service.get_team_stats(
-                        team['url'], team['name'])
-
-                    if stats:
-                        # Save the data
-                        filename = f"{team_id}_{timestamp}.json"
-                        if self.save_data_with_retry(stats, filename, 'teams'):
-                            logger.info(
-                                f"{team['name']} detailed statistics saved successfully")
-                        else:
-                            logger.error(
-                                f"Failed to save {team['name']} statistics")
+        for team_name, team in self._get_team_index(teams):
+            # If teams_to_analyze is empty, analyze all teams
+            if not team_filters or any(team_filter in team_name for team_filter in team_filters):
+                stats = self._load_team_stats(team, timestamp)
+                if stats:
+                    team_stats[team['id']] = stats
+                else:
+                    teams_to_fetch.append(team)
 
+        # Fetch the remaining teams concurrently, saving each as soon as it completes
+        if teams_to_fetch:
+            logger.info(
+                "\nFetching detailed statistics for %d teams", len(teams_to_fetch))
+            for team, stats in self._get_stats_service().iter_many(teams_to_fetch):
                 if stats:
-                    team_stats[team_id] = stats
+                    self._save_team_stats(team, stats, timestamp)
+                    team_stats[team['id']] = stats
 
         return team_stats
 
@@ -194,33 +268,55 @@ class TeamService(BaseService):
 
         team = self.get_team_by_name(team_name, teams)
         if not team:
-            logger.error(f"Team not found: {team_name}")
+            logger.error("Team not found: %s", team_name)
             return None
 
-        logger.info(f"\nFetching detailed statistics for team: {team['name']}")
+        logger.info("\nFetching detailed statistics for team: %s", team['name'])
+        return self._ensure_team_stats(team, self.get_timestamp())
 
-        # Check if we already have recent data for this team
-        team_id = team['id']
-        timestamp = self.get_timestamp()
-        recent_file = f"{team_id}_{timestamp}.json"
+    def _ensure_team_stats(self, team: Dict[str, str], timestamp: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a team's detailed statistics, loading today's saved copy or fetching and saving them.
 
-        # Try to load from existing file first
-        stats = self.load_data(recent_file, 'teams')
+        Args:
+            team: Team dictionary with 'name', 'url' and 'id' keys
+            timestamp: Timestamp the team's data file is named with
 
-        # If not found, fetch new data
+        Returns:
+            dict: Team statistics or None if error occurs
+        """
+        stats = self._load_team_stats(team, timestamp)
         if not stats:
-            from .team_stats_service import TeamStatsService
-            team_stats_service = TeamStatsService()
-            stats = team_stats_service.get_team_stats(
-                team['url'], team['name'])
-
+            stats = self._get_stats_service().get_team_stats(team['url'], team['name'])
             if stats:
-                # Save the data
-                filename = f"{team_id}_{timestamp}.json"
-                if self.save_data_with_retry(stats, filename, 'teams'):
-                    logger.info(
-                        f"{team['name']} detailed statistics saved successfully")
-                else:
-                    logger.error(f"Failed to save {team['name']} statistics")
-
+                self._save_team_stats(team, stats, timestamp)
         return stats
+
+    def _load_team_stats(self, team: Dict[str, str], timestamp: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a team's detailed statistics saved earlier under the given timestamp.
+
+        Args:
+            team: Team dictionary with an 'id' key
+            timestamp: Timestamp the team's data file is named with
+
+        Returns:
+            dict: Team statistics or None if none are saved
+        """
+        return self.load_data(f"{team['id']}_{timestamp}.json", 'teams')
+
+    def _save_team_stats(self, team: Dict[str, str], stats: Dict[str, Any], timestamp: str) -> None:
+        """
+        Save a team's detailed statistics.
+
+        Args:
+            team: Team dictionary with 'name' and 'id' keys
+            stats: Team statistics
+            timestamp: Timestamp to name the team's data file with
+        """
+        filename = f"{team['id']}_{timestamp}.json"
+        if self.save_data_with_retry(stats, filename, 'teams'):
+            logger.info(
+                "%s detailed statistics saved successfully", team['name'])
+        else:
+            logger.error("Failed to save %s statistics", team['name'])
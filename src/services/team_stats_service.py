@@ -1,18 +1,199 @@
 """
 Team stats service for handling detailed team statistics
 """
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List, Union
-from bs4 import BeautifulSoup
+import multiprocessing
+import sys
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, Any, Iterator, Optional, List, Tuple, Union
+import lxml.html
+from lxml import etree
 from datetime import datetime
 import json
 
-from .base_service import BaseService
+from .base_service import BaseService, get_html_parser, keep_thread_driver
 from src.config import get_config
 from src.utils.webdriver_pool import get_webdriver_pool
 
 logger = logging.getLogger(__name__)
 
+# Player statistics tables on a squad page and the key each is stored under
+PLAYER_TABLES = [
+    ('stats_standard_9', 'stats'),
+    ('stats_keeper_9', 'goalkeeper_stats'),
+    ('stats_keeper_adv_9', 'goalkeeper_advanced_stats'),
+    ('stats_shooting_9', 'shooting_stats'),
+    ('stats_passing_9', 'passing_stats'),
+    ('stats_passing_types_9', 'pass_types_stats'),
+    ('stats_gca_9', 'goal_creation_stats'),
+    ('stats_defense_9', 'defense_stats'),
+    ('stats_possession_9', 'possession_stats'),
+    ('stats_playing_time_9', 'playing_time_stats'),
+    ('stats_misc_9', 'miscellaneous_stats'),
+]
+
+# Match logs table on a squad page
+MATCH_LOGS_TABLE_ID = 'matchlogs_for'
+
+# Every table parse_team_page reads, located in one traversal by exact id
+STAT_TABLES = etree.XPath('//table[{}]'.format(' or '.join(
+    f"@id='{table_id}'" for table_id in [MATCH_LOGS_TABLE_ID] + [t for t, _ in PLAYER_TABLES])))
+
+# Body rows of a table, without the header rows FBRef repeats every few rows
+BODY_ROWS = etree.XPath("tbody/tr[not(contains(@class, 'thead'))]")
+
+# Cells of a table row that carry a data-stat name
+STAT_CELLS = etree.XPath("./td[@data-stat!='']|./th[@data-stat!='']")
+
+# Href of the link in a row's header cell ('' if there is none)
+HEADER_LINK = etree.XPath('string(th[1]//a/@href)', smart_strings=False)
+
+# Start method of parse worker processes. Forking while fetch and logging threads
+# hold locks can deadlock the child, so workers are spawned on every platform
+PARSE_MP_CONTEXT = multiprocessing.get_context('spawn')
+
+# Version of parse_team_page's output, bump it to invalidate cached parse results
+PARSE_CACHE_VERSION = 1
+
+# Columns whose values repeat across rows, tables and teams (names and categories)
+INTERNED_STATS = frozenset({
+    'player', 'nationality', 'position', 'comp', 'round', 'dayofweek',
+    'venue', 'result', 'opponent', 'formation', 'captain', 'referee'
+})
+
+
+def parse_team_page(page_source: str, team_url: str, team_name: str,
+                    base_url: str, timestamp: str) -> Dict[str, Any]:
+    """
+    Parse the statistics tables of a team page.
+
+    This is a pure function of its arguments so it can run in a worker process.
+
+    Args:
+        page_source: Page content
+        team_url: URL of the team's page
+        team_name: Name of the team
+        base_url: FBRef base URL player links are relative to
+        timestamp: Timestamp to record in the team data
+
+    Returns:
+        dict: Team statistics
+    """
+    root = lxml.html.fromstring(page_source, parser=get_html_parser())
+
+    # Initialize team data structure
+    team_data = {
+        'url': team_url,
+        'name': team_name,
+        'timestamp': timestamp,
+        'players': {},  # All player stats will be stored here
+        'matches': [],  # Keep matches separate as it's team-level data
+        '_positions': Counter()  # Players by position, popped by _log_team_summary
+    }
+
+    # Collect all statistics tables in a single pass over the document
+    tables = {table.get('id'): table for table in STAT_TABLES(root)}
+
+    # Process all statistics tables
+    _process_match_logs(tables.get(MATCH_LOGS_TABLE_ID), team_data)
+    for table_id, stats_key in PLAYER_TABLES:
+        table = tables.get(table_id)
+        if table is not None:
+            _process_player_table(table, team_data, stats_key, base_url)
+        else:
+            logger.warning("%s table not found", table_id)
+
+    return team_data
+
+
+def _process_match_logs(matches_table: Optional[lxml.html.HtmlElement], team_data: Dict[str, Any]) -> None:
+    """
+    Process match logs table.
+
+    Args:
+        matches_table: Match logs table element or None if the page has none
+        team_data: Team data dictionary to update
+    """
+    if matches_table is not None:
+        for match_data, _ in _iter_table_rows(matches_table):
+            if match_data:
+                team_data['matches'].append(match_data)
+    else:
+        logger.warning("Match logs table not found")
+
+
+def _process_player_table(table: lxml.html.HtmlElement, team_data: Dict[str, Any],
+                          stats_key: str, base_url: str) -> None:
+    """
+    Process a player statistics table.
+
+    Args:
+        table: Table element
+        team_data: Team data dictionary to update
+        stats_key: Key to store the statistics under in the player dictionary
+        base_url: FBRef base URL player links are relative to
+    """
+    try:
+        players = team_data['players']
+        row_count = 0
+        for stats, link in _iter_table_rows(table, require_link=True):
+            player_name = stats.get('player')
+            if not link or not player_name:
+                continue
+
+            # Initialize player if not exists
+            if player_name not in players:
+                position = stats.get('position', 'Unknown')
+                players[player_name] = {
+                    'url': f"{base_url}{link}",
+                    'position': position
+                }
+                team_data['_positions'][position] += 1
+
+            # Add stats to player
+            players[player_name][stats_key] = stats
+            row_count += 1
+
+        logger.debug("Extracted %d rows from %s table", row_count, stats_key)
+
+    except Exception as e:
+        logger.error("Error processing %s table: %s", stats_key, e)
+
+
+def _iter_table_rows(table: lxml.html.HtmlElement,
+                     require_link: bool = False) -> Iterator[Tuple[Dict[str, str], Optional[str]]]:
+    """
+    Iterate over the body rows of a statistics table.
+
+    Rows are yielded as they are extracted so callers merge them in the same
+    pass. Stat names are interned so the same data-stat key is shared across
+    rows, tables and teams, and so are the values of INTERNED_STATS columns,
+    e.g. one name object per player across the players dict keys and every
+    table's 'player' value.
+
+    Args:
+        table: Table element
+        require_link: Skip rows whose header cell has no link (repeated header
+            and summary rows) before extracting any of their cells
+
+    Yields:
+        tuple: Row values keyed by data-stat name and the href of the row's
+            header link (None if the row has none)
+    """
+    for row in BODY_ROWS(table):
+        link = HEADER_LINK(row) or None
+        if link is None and require_link:
+            continue
+
+        row_data = {sys.intern(cell.get('data-stat')): cell.text_content().strip()
+                    for cell in STAT_CELLS(row)}
+        for stat_name in INTERNED_STATS.intersection(row_data):
+            row_data[stat_name] = sys.intern(row_data[stat_name])
+
+        yield row_data, link
+
 
 class TeamStatsService(BaseService):
     """Service for handling detailed team statistics."""
@@ -32,275 +213,253 @@ class TeamStatsService(BaseService):
         Returns:
             dict: Team statistics or None if error occurs
         """
-        logger.info(f"Fetching team statistics from: {team_url}")
-
         try:
-            # Analyze the page structure if debug is enabled
-            if self.config.get('debug_enabled', False):
-                from debug.html_analyzer import HTMLAnalyzer
-                html_analyzer = HTMLAnalyzer()
-                html_analyzer.analyze_page(team_url, save_html=True)
-
-            # Get the page with rate limiting
-            page_source = self.get_page_with_rate_limit(
-                team_url, domain="fbref")
+            page_source = self._fetch_team_page(team_url)
             if not page_source:
-                logger.error("Failed to load team page")
                 return None
 
-            # Parse the page
-            soup = BeautifulSoup(page_source, 'html.parser')
-
-            # Initialize team data structure
-            team_data = {
-                'url': team_url,
-                'name': team_name,
-                'timestamp': self.get_timestamp(),
-                'players': {},  # All player stats will be stored here
-                'matches': []   # Keep matches separate as it's team-level data
-            }
-
-            # Process all statistics tables
-            self._process_squad_statistics(soup, team_data)
-            self._process_match_logs(soup, team_data)
-            self._process_goalkeeper_statistics(soup, team_data)
-            self._process_shooting_statistics(soup, team_data)
-            self._process_passing_statistics(soup, team_data)
-            self._process_pass_types(soup, team_data)
-            self._process_goal_creation(soup, team_data)
-            self._process_defense_statistics(soup, team_data)
-            self._process_possession_statistics(soup, team_data)
-            self._process_playing_time(soup, team_data)
-            self._process_miscellaneous_stats(soup, team_data)
-
-            # After collecting all stats
-            player_count = len(team_data['players'])
-            logger.info(
-                f"Successfully collected data for {player_count} players")
-
-            # Count players by position
-            positions = {}
-            for player in team_data['players'].values():
-                pos = player.get('position', 'Unknown')
-                positions[pos] = positions.get(pos, 0) + 1
-
-            logger.info("\nPlayers by Position:")
-            for pos, count in sorted(positions.items()):
-                logger.info(f"{pos}: {count}")
-
-            return team_data
+            return self._parse_cached(
+                page_source, {'url': team_url, 'name': team_name}, self.get_timestamp())
 
         except Exception as e:
             logger.error(
-                f"Error fetching team statistics: {str(e)}", exc_info=True)
+                "Error fetching team statistics: %s", e, exc_info=True)
             return None
 
-    def _process_squad_statistics(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
+    def get_many(self, teams: List[Dict[str, str]],
+                 concurrency: Optional[int] = None) -> Dict[str, Optional[Dict[str, Any]]]:
         """
-        Process squad statistics table.
+        Get statistics for several teams concurrently.
 
         Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
-        """
-        squad_table = soup.find('table', {'id': 'stats_standard_9'})
-        if squad_table:
-            self._process_player_table(squad_table, team_data, 'stats')
-        else:
-            logger.warning("Squad statistics table not found")
+            teams: List of team dictionaries with 'name' and 'url' keys
+            concurrency: Maximum number of teams fetched at once
+                (defaults to max_concurrent_requests)
 
-    def _process_match_logs(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
+        Returns:
+            dict: Dictionary mapping team URLs to their statistics (None if fetching failed)
         """
-        Process match logs table.
+        results = {team['url']: None for team in teams}
+        results.update((team['url'], stats) for team, stats in self.iter_many(teams, concurrency))
+        return results
 
-        Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
+    def iter_many(self, teams: List[Dict[str, str]],
+                  concurrency: Optional[int] = None) -> Iterator[Tuple[Dict[str, str], Optional[Dict[str, Any]]]]:
         """
-        matches_table = soup.find('table', {'id': 'matchlogs_for'})
-        if matches_table:
-            match_rows = matches_table.find('tbody').find_all('tr')
-            for row in match_rows:
-                match_data = {}
-                for cell in row.find_all(['td', 'th']):
-                    stat_name = cell.get('data-stat')
-                    if stat_name:
-                        match_data[stat_name] = cell.text.strip()
-
-                if match_data:
-                    team_data['matches'].append(match_data)
-        else:
-            logger.warning("Match logs table not found")
+        Get statistics for several teams concurrently, yielding each team as it completes.
 
-    def _process_goalkeeper_statistics(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
-        """
-        Process goalkeeper statistics table.
+        Page fetches are network-bound, so they are overlapped in a thread pool.
+        Requests still go through the shared rate limiter, and each fetch thread
+        that falls back to a WebDriver keeps its own driver from the pool until
+        the fetches are done (see keep_thread_driver). Parsing is CPU-bound, so
+        with parse_processes above 1 each page is handed to one of that many
+        spawned worker processes as soon as it arrives, while the remaining
+        pages are fetched. Pages whose content was parsed before are answered
+        from the page cache.
 
         Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
-        """
-        gk_table = soup.find('table', {'id': 'stats_keeper_9'})
-        if gk_table:
-            self._process_player_table(gk_table, team_data, 'goalkeeper_stats')
-        else:
-            logger.warning("Goalkeeper statistics table not found")
+            teams: List of team dictionaries with 'name' and 'url' keys
+            concurrency: Maximum number of teams fetched at once
+                (defaults to max_concurrent_requests)
 
-    def _process_shooting_statistics(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
+        Yields:
+            tuple: Team dictionary and its statistics (None if fetching failed),
+                in completion order
         """
-        Process shooting statistics table.
+        if not teams:
+            return
 
-        Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
-        """
-        shooting_table = soup.find('table', {'id': 'stats_shooting_9'})
-        if shooting_table:
-            self._process_player_table(
-                shooting_table, team_data, 'shooting_stats')
-        else:
-            logger.warning("Shooting statistics table not found")
+        if concurrency is None:
+            concurrency = self.config.get('max_concurrent_requests', 4)
+        max_workers = max(1, min(concurrency, len(teams)))
+
+        parse_processes = min(self.config.get('parse_processes', 1), len(teams))
+        parse_executor = ProcessPoolExecutor(
+            max_workers=parse_processes, mp_context=PARSE_MP_CONTEXT) if parse_processes > 1 else None
+        timestamp = self.get_timestamp()
 
-    def _process_passing_statistics(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, initializer=keep_thread_driver) as fetch_executor:
+                fetches = {fetch_executor.submit(self._fetch_team_page, team['url']): team
+                           for team in teams}
+                parses = {}
+                pending = set(fetches)
+
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future in fetches:
+                            team = fetches[future]
+                            page_source = future.result()
+                            if not page_source:
+                                yield team, None
+                            elif parse_executor is None:
+                                yield team, self._parse_cached(page_source, team, timestamp)
+                            else:
+                                parse_key = self._get_parse_key(page_source, team)
+                                team_data = self._get_cached_parse(parse_key, team, timestamp)
+                                if team_data is not None:
+                                    yield team, team_data
+                                    continue
+
+                                parse_future = parse_executor.submit(
+                                    parse_team_page, page_source, team['url'], team['name'],
+                                    self.fbref_base_url, timestamp)
+                                parses[parse_future] = (team, parse_key)
+                                pending.add(parse_future)
+                            continue
+
+                        team, parse_key = parses[future]
+                        try:
+                            team_data = future.result()
+                        except Exception as e:
+                            logger.error(
+                                "Error parsing team statistics for %s: %s", team['name'], e)
+                            yield team, None
+                            continue
+
+                        self._log_team_summary(team_data)
+                        self.page_cache.set_parsed(parse_key, team_data)
+                        yield team, team_data
+        finally:
+            if parse_executor is not None:
+                parse_executor.shutdown(cancel_futures=True)
+
+    def _fetch_team_page(self, team_url: str) -> Optional[str]:
         """
-        Process passing statistics table.
+        Fetch a team page, analyzing its structure if debug is enabled.
 
         Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
-        """
-        passing_table = soup.find('table', {'id': 'stats_passing_9'})
-        if passing_table:
-            self._process_player_table(
-                passing_table, team_data, 'passing_stats')
-        else:
-            logger.warning("Passing statistics table not found")
+            team_url: URL of the team's page
 
-    def _process_pass_types(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
+        Returns:
+            str: Page content or None if fetching failed
         """
-        Process pass types table.
+        logger.info("Fetching team statistics from: %s", team_url)
 
-        Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
-        """
-        pass_types_table = soup.find('table', {'id': 'stats_passing_types_9'})
-        if pass_types_table:
-            self._process_player_table(
-                pass_types_table, team_data, 'pass_types_stats')
-        else:
-            logger.warning("Pass types statistics table not found")
+        try:
+            # Get the page with rate limiting
+            page_source = self.get_page_with_rate_limit(
+                team_url, domain="fbref", required_id='stats_standard_9')
+            if not page_source:
+                logger.error("Failed to load team page")
+                return None
 
-    def _process_goal_creation(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
-        """
-        Process goal creation table.
+            # Analyze the page structure if debug is enabled
+            if self.config.get('debug_enabled', False):
+                from debug.html_analyzer import HTMLAnalyzer
+                html_analyzer = HTMLAnalyzer()
+                html_analyzer.analyze_page(
+                    team_url, save_html=True, page_source=page_source)
 
-        Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
-        """
-        gca_table = soup.find('table', {'id': 'stats_gca_9'})
-        if gca_table:
-            self._process_player_table(
-                gca_table, team_data, 'goal_creation_stats')
-        else:
-            logger.warning("Goal creation statistics table not found")
+            return page_source
+
+        except Exception as e:
+            logger.error(
+                "Error fetching team statistics: %s", e, exc_info=True)
+            return None
 
-    def _process_defense_statistics(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
+    def _get_parse_key(self, page_source: str, team: Dict[str, str]) -> str:
         """
-        Process defense statistics table.
+        Get the page cache key of a team page's parse result.
+
+        The key covers the page content and every other input that shapes the
+        result, so a changed page or parser never matches a stale entry.
 
         Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
+            page_source: Page content
+            team: Team dictionary with 'name' and 'url' keys
+
+        Returns:
+            str: Cache key
         """
-        defense_table = soup.find('table', {'id': 'stats_defense_9'})
-        if defense_table:
-            self._process_player_table(
-                defense_table, team_data, 'defense_stats')
-        else:
-            logger.warning("Defense statistics table not found")
+        digest = hashlib.sha256(page_source.encode('utf-8'))
+        digest.update(repr((PARSE_CACHE_VERSION, team['url'], team['name'], self.fbref_base_url)).encode('utf-8'))
+        return f"team_stats_{digest.hexdigest()}"
 
-    def _process_possession_statistics(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
+    def _get_cached_parse(self, parse_key: str, team: Dict[str, str],
+                          timestamp: str) -> Optional[Dict[str, Any]]:
         """
-        Process possession statistics table.
+        Get the statistics parsed earlier from an unchanged team page.
 
         Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
+            parse_key: Parse cache key of the page
+            team: Team dictionary with a 'url' key
+            timestamp: Timestamp of the current scrape, recorded in the reused team data
+
+        Returns:
+            dict: Team statistics or None if the page was not parsed before
         """
-        possession_table = soup.find('table', {'id': 'stats_possession_9'})
-        if possession_table:
-            self._process_player_table(
-                possession_table, team_data, 'possession_stats')
-        else:
-            logger.warning("Possession statistics table not found")
+        team_data = self.page_cache.get_parsed(parse_key)
+        if team_data is None:
+            return None
+
+        logger.info("Reusing parsed statistics for unchanged page %s", team['url'])
+        team_data['timestamp'] = timestamp
+        return team_data
 
-    def _process_playing_time(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
+    def _parse_cached(self, page_source: str, team: Dict[str, str],
+                      timestamp: str) -> Optional[Dict[str, Any]]:
         """
-        Process playing time table.
+        Parse a fetched team page in this process, unless the same page was parsed before.
 
         Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
+            page_source: Page content
+            team: Team dictionary with 'name' and 'url' keys
+            timestamp: Timestamp to record in newly parsed team data
+
+        Returns:
+            dict: Team statistics or None if parsing failed
         """
-        playing_time_table = soup.find('table', {'id': 'stats_playing_time_9'})
-        if playing_time_table:
-            self._process_player_table(
-                playing_time_table, team_data, 'playing_time_stats')
-        else:
-            logger.warning("Playing time statistics table not found")
+        parse_key = self._get_parse_key(page_source, team)
+        team_data = self._get_cached_parse(parse_key, team, timestamp)
+        if team_data is not None:
+            return team_data
+
+        team_data = self._parse_or_none(page_source, team, timestamp)
+        if team_data is not None:
+            self.page_cache.set_parsed(parse_key, team_data)
+        return team_data
 
-    def _process_miscellaneous_stats(self, soup: BeautifulSoup, team_data: Dict[str, Any]) -> None:
+    def _parse_or_none(self, page_source: str, team: Dict[str, str],
+                       timestamp: str) -> Optional[Dict[str, Any]]:
         """
-        Process miscellaneous statistics table.
+        Parse a fetched team page in this process.
 
         Args:
-            soup: BeautifulSoup object
-            team_data: Team data dictionary to update
+            page_source: Page content
+            team: Team dictionary with 'name' and 'url' keys
+            timestamp: Timestamp to record in the team data
+
+        Returns:
+            dict: Team statistics or None if parsing failed
         """
-        misc_table = soup.find('table', {'id': 'stats_misc_9'})
-        if misc_table:
-            self._process_player_table(
-                misc_table, team_data, 'miscellaneous_stats')
-        else:
-            logger.warning("Miscellaneous statistics table not found")
+        try:
+            team_data = parse_team_page(
+                page_source, team['url'], team['name'], self.fbref_base_url, timestamp)
+        except Exception as e:
+            logger.error(
+                "Error parsing team statistics for %s: %s", team['name'], e, exc_info=True)
+            return None
+
+        self._log_team_summary(team_data)
+        return team_data
 
-    def _process_player_table(self, table: BeautifulSoup, team_data: Dict[str, Any], stats_key: str) -> None:
+    def _log_team_summary(self, team_data: Dict[str, Any]) -> None:
         """
-        Process a player statistics table.
+        Log the number of players collected for a team, by position.
+
+        The position counts were tallied as players were inserted, so this
+        also removes them from the team data before it is returned.
 
         Args:
-            table: BeautifulSoup table element
-            team_data: Team data dictionary to update
-            stats_key: Key to store the statistics under in the player dictionary
+            team_data: Parsed team statistics
         """
-        try:
-            rows = table.find('tbody').find_all('tr')
-            for row in rows:
-                player_cell = row.find('th', {'data-stat': 'player'})
-                if not player_cell or not player_cell.find('a'):
-                    continue
-
-                player_name = player_cell.find('a').text.strip()
-                player_url = f"{self.config.get('fbref_base_url')}{player_cell.find('a')['href']}"
-
-                # Get all stats for the player
-                stats = {}
-                for cell in row.find_all(['td', 'th']):
-                    stat_name = cell.get('data-stat')
-                    if stat_name:
-                        stats[stat_name] = cell.text.strip()
-
-                # Initialize player if not exists
-                if player_name not in team_data['players']:
-                    team_data['players'][player_name] = {
-                        'url': player_url,
-                        'position': stats.get('position', 'Unknown')
-                    }
-
-                # Add stats to player
-                team_data['players'][player_name][stats_key] = stats
+        positions = team_data.pop('_positions', None) or Counter()
+        logger.info(
+            "Successfully collected data for %d players", len(team_data['players']))
 
-        except Exception as e:
-            logger.error(f"Error processing {stats_key} table: {str(e)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\nPlayers by Position:")
+            for pos, count in sorted(positions.items()):
+                logger.info("%s: %d", pos, count)
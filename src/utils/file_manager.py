@@ -1,21 +1,86 @@
 import os
 import json
+import hashlib
 import shutil
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
 from .logger import get_logger
+from src.config import get_config
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = get_logger()
 
+ZSTD_SUFFIX = '.zst'
+HASH_SUFFIX = '.sha'
+
+# Categories data files are saved under
+DATA_CATEGORIES = ('teams', 'standings', 'stats')
+
+# Suffixes of backed-up data files, plain or zstd-compressed
+BACKUP_SUFFIXES = ('.json', f'.json{ZSTD_SUFFIX}')
+
+def _dump_json(data: Any, indent: bool = True) -> bytes:
+    """
+    Serialize data to UTF-8 JSON, using orjson when it is installed
+    
+    Args:
+        data: Data to serialize
+        indent: Pretty-print with two-space indentation
+        
+    Returns:
+        bytes: Serialized JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _load_json(data: bytes) -> Any:
+    """
+    Deserialize UTF-8 JSON, using orjson when it is installed
+    
+    Args:
+        data: Serialized JSON
+        
+    Returns:
+        Deserialized data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 class FileManager:
-    def __init__(self, base_dir: Optional[str] = None):
+    def __init__(self, base_dir: Optional[str] = None, compress: Optional[bool] = None):
         """
         Initialize FileManager
         
         Args:
             base_dir: Base directory for all operations. Defaults to project root.
+            compress: Save data as zstd-compressed .json.zst files. Defaults to the
+                save_compressed_json config setting.
         """
+        config = get_config()
+        if compress is None:
+            compress = config.get('save_compressed_json', False)
+        if compress and zstd is None:
+            logger.warning("zstandard is not installed, saving uncompressed JSON")
+            compress = False
+        self.compress = compress
+        self.compression_level = config.get('json_compression_level', 3)
+        
         if base_dir is None:
             base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.base_dir = Path(base_dir)
@@ -29,11 +94,98 @@ class FileManager:
         
         for dir_path in self.dirs.values():
             dir_path.mkdir(parents=True, exist_ok=True)
+        
+        # Category and backup directories, resolved once
+        self._category_dirs = {category: self.dirs['data'] / category for category in DATA_CATEGORIES}
+        self._backup_dirs = {category: path / 'backups' for category, path in self._category_dirs.items()}
+    
+    def _get_category_dir(self, category: str) -> Path:
+        """
+        Get the directory a category's data files are saved in
+        
+        Args:
+            category: Category of data (teams, standings, etc.)
+            
+        Returns:
+            Path: Category directory
+        """
+        path = self._category_dirs.get(category)
+        if path is None:
+            path = self._category_dirs[category] = self.dirs['data'] / category
+        return path
+    
+    def _get_backup_dir(self, category: str) -> Path:
+        """
+        Get the directory a category's data files are backed up to
+        
+        Args:
+            category: Category of data (teams, standings, etc.)
+            
+        Returns:
+            Path: Backup directory
+        """
+        path = self._backup_dirs.get(category)
+        if path is None:
+            path = self._backup_dirs[category] = self._get_category_dir(category) / 'backups'
+        return path
+    
+    def _get_data_path(self, filename: str, category: str) -> Path:
+        """
+        Get the path data saved under a filename is written to
+        
+        Args:
+            filename: Name of the file
+            category: Category of data (teams, standings, etc.)
+            
+        Returns:
+            Path: Path of the data file
+        """
+        filepath = self._get_category_dir(category) / filename
+        if self.compress:
+            filepath = filepath.with_name(f"{filepath.name}{ZSTD_SUFFIX}")
+        return filepath
+    
+    def _serialize(self, data: Any) -> bytes:
+        """
+        Serialize data the way it is saved (compact when it is compressed afterwards)
+        
+        Args:
+            data: Data to serialize
+            
+        Returns:
+            bytes: Serialized JSON
+        """
+        return _dump_json(data, indent=not self.compress)
+    
+    def _read_saved_hash(self, filepath: Path) -> Optional[str]:
+        """
+        Get the data hash recorded when a data file was last saved
+        
+        Args:
+            filepath: Path of the data file
+            
+        Returns:
+            str: Hex digest from the .sha sidecar, None if the file or its hash is missing
+        """
+        hash_path = filepath.with_name(f"{filepath.name}{HASH_SUFFIX}")
+        try:
+            if not filepath.exists():
+                return None
+            return hash_path.read_text(encoding='utf-8').strip()
+        except OSError:
+            return None
     
     def save_data(self, data: Dict[str, Any], filename: str, category: str) -> Optional[str]:
         """
         Save data to a JSON file in the appropriate category directory
         
+        If the file already holds exactly this data nothing is written. Otherwise
+        the new content is written to a temporary file, the existing file is
+        hard-linked (or copied) into the backups directory and the temporary
+        file is renamed over it, so the data file is never missing or left
+        half-written. Temporary files are named per process and thread, as
+        several threads may save the same file at once.
+        
         Args:
             data: Data to save
             filename: Name of the file
@@ -43,34 +195,63 @@ class FileManager:
             str: Path to saved file if successful, None otherwise
         """
         try:
-            filepath = self.dirs['data'] / category / filename
+            filepath = self._get_data_path(filename, category)
             filepath.parent.mkdir(parents=True, exist_ok=True)
             
-            # Ensure filename has .json extension
-            if not filename.endswith('.json'):
-                filename = filepath.name
-                filepath = filepath.parent / filename
+            payload = self._serialize(data)
+            data_hash = hashlib.blake2b(payload, digest_size=16).hexdigest()
+            if self._read_saved_hash(filepath) == data_hash:
+                logger.info("%s is unchanged, skipping save", filepath)
+                return str(filepath)
             
-            # Backup existing file if it exists
-            if filepath.exists():
-                backup_dir = self.dirs['data'] / category / 'backups'
-                backup_dir.mkdir(parents=True, exist_ok=True)
+            if self.compress:
+                payload = zstd.ZstdCompressor(level=self.compression_level).compress(payload)
+            
+            tmp_suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp_path = filepath.with_name(f".{filepath.name}.{tmp_suffix}")
+            hash_path = filepath.with_name(f"{filepath.name}{HASH_SUFFIX}")
+            backup_tmp_path = None
+            try:
+                tmp_path.write_bytes(payload)
+                
+                # Drop the old hash first so a crash before the new one is written
+                # can only cause a needless rewrite, never a wrongly skipped save
+                hash_path.unlink(missing_ok=True)
                 
-                timestamp = datetime.now().strftime('%Y%m%d')
-                backup_name = f"{filepath.stem}_{timestamp}.json"
-                backup_path = backup_dir / backup_name
+                # Link the existing file into the backups directory instead of copying
+                # it, keeping it in place until the new file replaces it
+                if filepath.exists():
+                    backup_dir = self._get_backup_dir(category)
+                    backup_dir.mkdir(parents=True, exist_ok=True)
+                    
+                    timestamp = datetime.now().strftime('%Y%m%d')
+                    base_name, _, extension = filepath.name.partition('.')
+                    backup_path = backup_dir / f"{base_name}_{timestamp}.{extension}"
+                    
+                    backup_tmp_path = backup_dir / f".{backup_path.name}.{tmp_suffix}"
+                    try:
+                        os.link(filepath, backup_tmp_path)
+                    except OSError:
+                        # Filesystems without hard links
+                        shutil.copy2(filepath, backup_tmp_path)
+                    os.replace(backup_tmp_path, backup_path)
+                    logger.info("Created backup: %s", backup_path)
                 
-                shutil.copy2(filepath, backup_path)
-                logger.info(f"Created backup: {backup_path}")
+                os.replace(tmp_path, filepath)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                if backup_tmp_path is not None:
+                    backup_tmp_path.unlink(missing_ok=True)
+                raise
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Record the data hash so an identical save can be skipped next time
+            hash_path.write_text(data_hash, encoding='utf-8')
                 
-            logger.info(f"Saved data to: {filepath}")
+            logger.info("Saved data to: %s", filepath)
             return str(filepath)
             
         except Exception as e:
-            logger.error(f"Error saving data: {str(e)}", exc_info=True)
+            logger.error("Error saving data: %s", e, exc_info=True)
             return None
     
     def load_data(self, filename: str, category: str) -> Optional[Dict[str, Any]]:
@@ -84,7 +265,7 @@ class FileManager:
         Returns:
             dict: Loaded data if successful, None otherwise
         """
-        if category not in ['teams', 'standings', 'stats']:
+        if category not in DATA_CATEGORIES:
             raise ValueError(f"Invalid category: {category}")
             
         try:
@@ -92,19 +273,35 @@ class FileManager:
             if not filename.endswith('.json'):
                 filename += '.json'
             
-            filepath = self.dirs['data'] / category / filename
+            filepath = self._category_dirs[category] / filename
+            compressed_path = filepath.with_name(f"{filename}{ZSTD_SUFFIX}")
             
-            if not filepath.exists():
-                logger.error(f"File not found: {filepath}")
+            # Compression may have been switched since a save, so the newer of
+            # the plain and compressed files holds the latest data
+            newest_path, newest_mtime = None, None
+            for path in (filepath, compressed_path) if zstd is not None else (filepath,):
+                try:
+                    mtime = path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if newest_mtime is None or mtime > newest_mtime:
+                    newest_path, newest_mtime = path, mtime
+            
+            if newest_path is None:
+                logger.error("File not found: %s", filepath)
                 return None
             
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            logger.debug(f"Loaded data from {filepath}")
+            filepath = newest_path
+            if filepath is compressed_path:
+                data = _load_json(zstd.ZstdDecompressor().decompress(filepath.read_bytes()))
+            else:
+                data = _load_json(filepath.read_bytes())
+            
+            logger.debug("Loaded data from %s", filepath)
             return data
             
         except Exception as e:
-            logger.error(f"Error loading data from {filename}: {str(e)}")
+            logger.error("Error loading data from %s: %s", filename, e)
             return None
     
     def cleanup_old_files(self, days: int = 7, categories: Optional[List[str]] = None) -> None:
@@ -116,23 +313,27 @@ class FileManager:
             categories: List of categories to clean up. If None, clean up all categories.
         """
         try:
-            cutoff = datetime.now() - timedelta(days=days)
+            cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
             
             if categories is None:
-                categories = ['teams', 'standings', 'stats']
+                categories = DATA_CATEGORIES
             
             for category in categories:
-                backup_dir = self.dirs['data'] / category / 'backups'
+                backup_dir = self._get_backup_dir(category)
                 if not backup_dir.exists():
                     continue
                 
-                for filepath in backup_dir.glob('*.json'):
-                    if filepath.stat().st_ctime < cutoff.timestamp():
-                        filepath.unlink()
-                        logger.debug(f"Deleted old file: {filepath}")
+                # Backups are plain or zstd-compressed JSON. DirEntry.stat() is a
+                # syscall on POSIX (only Windows serves it from the listing), so
+                # names are matched first and other files are never stat'ed
+                with os.scandir(backup_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(BACKUP_SUFFIXES) and entry.stat().st_ctime < cutoff_ts:
+                            os.unlink(entry.path)
+                            logger.debug("Deleted old file: %s", entry.path)
                         
         except Exception as e:
-            logger.error(f"Error cleaning up old files: {str(e)}")
+            logger.error("Error cleaning up old files: %s", e)
             
     def get_dir(self, category: str) -> Optional[str]:
         """
@@ -144,8 +345,8 @@ class FileManager:
         Returns:
             str: Directory path if it exists, None otherwise
         """
-        if category not in ['teams', 'standings', 'stats']:
-            logger.error(f"Invalid category: {category}")
+        if category not in DATA_CATEGORIES:
+            logger.error("Invalid category: %s", category)
             return None
             
-        return str(self.dirs['data'] / category)
+        return str(self._category_dirs[category])
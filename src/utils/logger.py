@@ -1,15 +1,22 @@
+import atexit
 import os
 import logging
+import queue
 import sys
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 _loggers = {}
+_listeners = {}
 
 def get_logger(name="fbref_scraper"):
     """
     Get or create a logger instance
     
+    Records are handed to the console and file handlers through a queue, so a
+    log call only enqueues the record and the formatting and I/O happen on the
+    listener's background thread.
+    
     Args:
         name (str): Name of the logger
         
@@ -42,7 +49,6 @@ def get_logger(name="fbref_scraper"):
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
     
     # File handler with rotation
     log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs')
@@ -54,11 +60,18 @@ def get_logger(name="fbref_scraper"):
         maxBytes=5*1024*1024,  # 5MB
         backupCount=5,
         encoding='utf-8',
-        delay=False  # Open the file immediately
+        delay=True  # Open the file when the first record is written
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    
+    # Queue records and write them from a background thread
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    _listeners[name] = listener
     
     # Prevent propagation to avoid duplicate logs
     logger.propagate = False
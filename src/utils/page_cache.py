@@ -0,0 +1,367 @@
+"""
+On-disk page cache to avoid re-scraping pages that have not changed since the last fetch
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+from src.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class PageCache:
+    """
+    Filesystem cache for fetched page sources.
+
+    FBRef pages only meaningfully change once per matchday, so a page fetched
+    within the last page_cache_ttl seconds is served straight from the cache.
+    Older entries keep their ETag and Last-Modified date so the next fetch can
+    be a conditional request.
+
+    Page bodies are stored content-addressed by their SHA-256, so a page that
+    comes back unchanged is never written twice. Results parsed from a page can
+    be stored alongside under a key derived from its content, so an unchanged
+    page is not parsed again either. A small metadata file per URL
+    records the fetch time, cache validators and content hash. Bodies are zstd-compressed,
+    falling back to gzip when the zstandard package is not installed.
+
+    prune removes pages not fetched for page_cache_max_age seconds, bodies no
+    metadata file refers to any more, and parse results not used for
+    parsed_cache_max_age seconds.
+
+    zstd (de)compressor instances must not be used from several threads at
+    once, and pages are cached from concurrent fetch threads, so each thread
+    lazily creates and then reuses its own pair.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the page cache.
+
+        Args:
+            cache_dir: Directory to store cached pages in. Defaults to the configured cache dir.
+        """
+        self.config = get_config()
+        self.enabled = self.config.get('page_cache_enabled', True)
+        self.cache_dir = Path(cache_dir or self.config.get('page_cache_dir'))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.compression_level = self.config.get('page_cache_compression_level', 3)
+        self._suffix = '.html.zst' if zstd is not None else '.html.gz'
+        self._parsed_suffix = '.pkl.zst' if zstd is not None else '.pkl.gz'
+        self._local = threading.local()
+
+    def _compress(self, data: bytes) -> bytes:
+        """
+        Compress a page body.
+
+        Args:
+            data: Page body
+
+        Returns:
+            bytes: Compressed page body
+        """
+        if zstd is None:
+            return gzip.compress(data, compresslevel=self.compression_level)
+
+        compressor = getattr(self._local, 'compressor', None)
+        if compressor is None:
+            compressor = self._local.compressor = zstd.ZstdCompressor(level=self.compression_level)
+        return compressor.compress(data)
+
+    def _decompress(self, data: bytes) -> bytes:
+        """
+        Decompress a page body.
+
+        Args:
+            data: Compressed page body
+
+        Returns:
+            bytes: Page body
+        """
+        if zstd is None:
+            return gzip.decompress(data)
+
+        decompressor = getattr(self._local, 'decompressor', None)
+        if decompressor is None:
+            decompressor = self._local.decompressor = zstd.ZstdDecompressor()
+        return decompressor.decompress(data)
+
+    def _get_meta_path(self, url: str) -> Path:
+        """
+        Get the metadata file path for a URL.
+
+        Args:
+            url: URL of the cached page
+
+        Returns:
+            Path: Path of the metadata file
+        """
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _get_body_path(self, content_hash: str) -> Path:
+        """
+        Get the file path of a stored page body.
+
+        Args:
+            content_hash: SHA-256 of the page source
+
+        Returns:
+            Path: Path of the page body
+        """
+        return self.cache_dir / f"{content_hash}{self._suffix}"
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """
+        Write a file so that readers never see a partial write.
+
+        Args:
+            path: Destination path
+            data: File contents
+        """
+        # Fetch threads of one process may write the same path at once
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def get_entry(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        Get the cache metadata for a URL, regardless of when it was fetched.
+
+        Args:
+            url: URL of the page
+
+        Returns:
+            dict: 'fetched_at', 'etag', 'last_modified' and 'sha256' of the cached
+                page or None if the page is not cached
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            entry = json.loads(self._get_meta_path(url).read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Discarding unreadable cache metadata for %s: %s", url, e)
+            return None
+
+        if not self._get_body_path(entry.get('sha256', '')).exists():
+            return None
+        return entry
+
+    def load(self, url: str, entry: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Load the cached page source for a URL, regardless of when it was fetched.
+
+        Args:
+            url: URL of the page
+            entry: Cache metadata from get_entry, looked up if not given
+
+        Returns:
+            str: Cached page source or None if the page is not cached
+        """
+        entry = entry or self.get_entry(url)
+        if not entry:
+            return None
+
+        path = self._get_body_path(entry['sha256'])
+        try:
+            return self._decompress(path.read_bytes()).decode('utf-8')
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Discarding unreadable cache entry for %s: %s", url, e)
+            path.unlink(missing_ok=True)
+            return None
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Get a page source cached within the last page_cache_ttl seconds.
+
+        Args:
+            url: URL of the page
+
+        Returns:
+            str: Cached page source or None on a cache miss
+        """
+        entry = self.get_entry(url)
+        if not entry:
+            return None
+
+        ttl = self.config.get('page_cache_ttl', 6 * 60 * 60)
+        if time.time() - entry.get('fetched_at', 0) >= ttl:
+            return None
+
+        page_source = self.load(url, entry)
+        if page_source:
+            logger.info("Loaded %s from page cache", url)
+        return page_source
+
+    def set(self, url: str, page_source: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """
+        Store a page source in the cache.
+
+        Args:
+            url: URL of the page
+            page_source: Page source to store
+            etag: ETag the server returned for the page, if any
+            last_modified: Last-Modified date the server returned for the page, if any
+        """
+        if not self.enabled or not page_source:
+            return
+
+        data = page_source.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+        try:
+            path = self._get_body_path(content_hash)
+            if path.exists():
+                logger.debug("%s unchanged since it was last cached", url)
+            else:
+                self._write_atomic(path, self._compress(data))
+
+            entry = {
+                'fetched_at': time.time(),
+                'etag': etag,
+                'last_modified': last_modified,
+                'sha256': content_hash
+            }
+            self._write_atomic(self._get_meta_path(url), json.dumps(entry).encode('utf-8'))
+            logger.debug("Cached %s at %s", url, path)
+        except Exception as e:
+            logger.warning("Could not cache page %s: %s", url, e)
+
+    def get_parsed(self, key: str) -> Optional[Any]:
+        """
+        Get a result previously parsed from a page.
+
+        Args:
+            key: Key the result was stored under (derived from the page content)
+
+        Returns:
+            The parsed result or None on a cache miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self.cache_dir / f"{key}{self._parsed_suffix}"
+        try:
+            data = pickle.loads(self._decompress(path.read_bytes()))
+            # Record the use so prune measures age from the last hit
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Discarding unreadable parsed cache entry %s: %s", key, e)
+            path.unlink(missing_ok=True)
+            return None
+
+    def set_parsed(self, key: str, data: Any) -> None:
+        """
+        Store a result parsed from a page.
+
+        Args:
+            key: Key to store the result under (derived from the page content)
+            data: Parsed result
+        """
+        if not self.enabled:
+            return
+
+        try:
+            self._write_atomic(self.cache_dir / f"{key}{self._parsed_suffix}",
+                               self._compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)))
+        except Exception as e:
+            logger.warning("Could not cache parsed entry %s: %s", key, e)
+
+    def prune(self, max_age: Optional[int] = None, parsed_max_age: Optional[int] = None) -> int:
+        """
+        Remove old pages, unreferenced page bodies and unused parse results.
+
+        Should not run while pages are being cached: a body stored by a
+        concurrent set before its metadata is written may be removed, which
+        only turns that page into a cache miss.
+
+        Args:
+            max_age: Seconds since its last fetch after which a page's metadata
+                is removed. Defaults to the configured page_cache_max_age.
+            parsed_max_age: Seconds since last use after which a parse result is
+                removed. Defaults to the configured parsed_cache_max_age.
+
+        Returns:
+            int: Number of files removed
+        """
+        if max_age is None:
+            max_age = self.config.get('page_cache_max_age', 30 * 24 * 60 * 60)
+        if parsed_max_age is None:
+            parsed_max_age = self.config.get('parsed_cache_max_age', 7 * 24 * 60 * 60)
+        now = time.time()
+
+        removed = 0
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                files = list(entries)
+
+            # Drop expired metadata, then every body the remaining metadata does not refer to
+            referenced = set()
+            for entry in files:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    meta = json.loads(Path(entry.path).read_text(encoding='utf-8'))
+                except Exception:
+                    meta = {}
+                if now - meta.get('fetched_at', 0) >= max_age:
+                    os.unlink(entry.path)
+                    removed += 1
+                else:
+                    referenced.add(meta.get('sha256'))
+
+            for entry in files:
+                if entry.name.endswith(self._suffix):
+                    expired = entry.name[:-len(self._suffix)] not in referenced
+                elif entry.name.endswith(self._parsed_suffix):
+                    expired = entry.stat().st_mtime < now - parsed_max_age
+                else:
+                    continue
+                if expired:
+                    os.unlink(entry.path)
+                    removed += 1
+        except OSError as e:
+            logger.warning("Could not prune page cache: %s", e)
+
+        if removed:
+            logger.info("Pruned %d files from the page cache", removed)
+        return removed
+
+
+# Create a singleton instance
+_page_cache = PageCache()
+
+
+def get_page_cache() -> PageCache:
+    """
+    Get the page cache instance.
+
+    Returns:
+        PageCache: The page cache instance
+    """
+    return _page_cache
@@ -4,9 +4,7 @@ Rate limiter implementation to prevent IP blocking by limiting request frequency
 import time
 import threading
 import logging
-from typing import Dict, Any, Optional
-from collections import deque
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
 
 from src.config import get_config
 
@@ -15,83 +13,124 @@ logger = logging.getLogger(__name__)
 
 class RateLimiter:
     """
-    Rate limiter that restricts the number of requests within a time period.
-    Implements the Singleton pattern to ensure only one rate limiter exists.
+    Token-bucket rate limiter that restricts the request rate per domain.
+
+    Each domain has a bucket of up to max_requests tokens that refills at
+    max_requests per period seconds (the domain's entry in rate_limits, or the
+    default limits for domains without one), measured on the monotonic clock. A request
+    takes one token, so bursts of up to max_requests are admitted immediately
+    while the long-run rate stays at the configured limit. Each bucket has its
+    own plain lock held only for the O(1) bucket update, and waiting happens
+    outside it, so fetch threads for different domains never contend and
+    threads for the same domain only serialize on the update.
+    One shared instance is created at import time and returned by get_rate_limiter.
     """
-    _instance = None
-    _lock = threading.RLock()
-
-    def __new__(cls):
-        """Implement singleton pattern with thread safety."""
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(RateLimiter, cls).__new__(cls)
-                cls._instance._initialized = False
-        return cls._instance
 
     def __init__(self):
         """Initialize the rate limiter."""
-        with self._lock:
-            if self._initialized:
-                return
-
-            self.config = get_config()
-            self.requests = deque()
-            self.max_requests = self.config.get('rate_limit_requests', 10)
-            self.period = self.config.get('rate_limit_period', 60)  # seconds
-            self._initialized = True
-            logger.info(
-                f"Rate limiter initialized: {self.max_requests} requests per {self.period} seconds")
+        self.config = get_config()
+        self.max_requests = self.config.get('rate_limit_requests', 10)
+        self.period = self.config.get('rate_limit_period', 60)  # seconds
+        self.domain_limits: Dict[str, Tuple[int, float]] = {
+            domain: tuple(limits) for domain, limits in self.config.get('rate_limits', {}).items()}
+        self.buckets: Dict[str, Dict[str, float]] = {}
+        self._domain_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()  # Guards lock creation and limit updates
+        logger.info(
+            "Rate limiter initialized: %d requests per %s seconds", self.max_requests, self.period)
+
+    def _get_domain_lock(self, domain: str) -> threading.Lock:
+        """
+        Get the lock guarding a domain's bucket, creating it on first use.
+
+        Args:
+            domain: The domain to rate limit
+
+        Returns:
+            threading.Lock: The domain's lock
+        """
+        lock = self._domain_locks.get(domain)
+        if lock is None:
+            with self._lock:
+                lock = self._domain_locks.setdefault(domain, threading.Lock())
+        return lock
+
+    def _get_limits(self, domain: str) -> Tuple[int, float]:
+        """
+        Get the rate limit that applies to a domain.
+
+        Args:
+            domain: The domain to rate limit
+
+        Returns:
+            tuple: Maximum number of requests and period in seconds
+        """
+        return self.domain_limits.get(domain) or (self.max_requests, self.period)
+
+    def _refill(self, domain: str) -> Dict[str, float]:
+        """
+        Get a domain's bucket with the tokens accrued since its last refill added.
+
+        Must be called with the domain's lock held.
+
+        Args:
+            domain: The domain to rate limit
+
+        Returns:
+            dict: The domain's bucket ('tokens' and 'last_refill')
+        """
+        now = time.monotonic()
+        max_requests, period = self._get_limits(domain)
+        bucket = self.buckets.get(domain)
+        if bucket is None:
+            bucket = self.buckets[domain] = {'tokens': float(max_requests), 'last_refill': now}
+        else:
+            rate = max_requests / period
+            bucket['tokens'] = min(
+                max_requests, bucket['tokens'] + (now - bucket['last_refill']) * rate)
+            bucket['last_refill'] = now
+        return bucket
 
     def wait_if_needed(self, domain: str = "default") -> None:
         """
-        Wait if the rate limit has been reached.
+        Wait until a request to the domain is allowed, and count it.
 
         Args:
             domain: The domain to rate limit (allows different limits for different domains)
         """
-        with self._lock:
-            now = time.time()
-
-            # Remove requests older than the period
-            while self.requests and self.requests[0] < now - self.period:
-                self.requests.popleft()
-
-            # If we've reached the limit, wait until we can make another request
-            if len(self.requests) >= self.max_requests:
-                wait_time = self.period - (now - self.requests[0])
-                if wait_time > 0:
-                    logger.info(
-                        f"Rate limit reached. Waiting {wait_time:.2f} seconds before next request")
-                    time.sleep(wait_time)
-                    # After waiting, clean up old requests again
-                    now = time.time()
-                    while self.requests and self.requests[0] < now - self.period:
-                        self.requests.popleft()
-
-            # Add the current request
-            self.requests.append(now)
+        lock = self._get_domain_lock(domain)
+        while True:
+            with lock:
+                bucket = self._refill(domain)
+                if bucket['tokens'] >= 1:
+                    bucket['tokens'] -= 1
+                    return
+                max_requests, period = self._get_limits(domain)
+                wait_time = (1 - bucket['tokens']) * period / max_requests
+
+            logger.info(
+                "Rate limit reached. Waiting %.2f seconds before next request", wait_time)
+            time.sleep(wait_time)
 
     def record_request(self, domain: str = "default") -> None:
         """
-        Record a request without waiting.
+        Count a request that was made without calling wait_if_needed first.
+
+        Requests that went through wait_if_needed are already counted. The
+        bucket may go negative, which delays the following requests.
 
         Args:
             domain: The domain of the request
         """
-        with self._lock:
-            now = time.time()
-
-            # Remove requests older than the period
-            while self.requests and self.requests[0] < now - self.period:
-                self.requests.popleft()
-
-            # Add the current request
-            self.requests.append(now)
+        with self._get_domain_lock(domain):
+            self._refill(domain)['tokens'] -= 1
 
     def get_remaining_quota(self, domain: str = "default") -> int:
         """
-        Get the number of requests remaining in the current period.
+        Get the number of requests that can be made right now without waiting.
+
+        This is a lock-free estimate from a snapshot of the bucket that does not
+        refill it, so reading it never delays a request.
 
         Args:
             domain: The domain to check
@@ -99,32 +138,55 @@ class RateLimiter:
         Returns:
             int: Number of requests remaining
         """
-        with self._lock:
-            now = time.time()
+        max_requests, period = self._get_limits(domain)
+        bucket = self.buckets.get(domain)
+        if bucket is None:
+            return max_requests
 
-            # Remove requests older than the period
-            while self.requests and self.requests[0] < now - self.period:
-                self.requests.popleft()
+        tokens, last_refill = bucket['tokens'], bucket['last_refill']
+        tokens = min(max_requests, tokens + (time.monotonic() - last_refill) * max_requests / period)
+        return max(0, int(tokens))
 
-            return max(0, self.max_requests - len(self.requests))
-
-    def update_limits(self, max_requests: Optional[int] = None, period: Optional[int] = None) -> None:
+    def update_limits(self, max_requests: Optional[int] = None, period: Optional[int] = None,
+                      domain: Optional[str] = None) -> None:
         """
         Update rate limiting parameters.
 
         Args:
             max_requests: Maximum number of requests in the period
             period: Time period in seconds
+            domain: Domain to set its own limits for (None updates the default limits)
         """
         with self._lock:
-            if max_requests is not None:
-                self.max_requests = max_requests
-
-            if period is not None:
-                self.period = period
+            domain_locks = list(self._domain_locks.values())
+            for lock in domain_locks:
+                lock.acquire()
+            try:
+                # Settle the buckets at the old rate before switching to the new one
+                for bucket_domain in self.buckets:
+                    self._refill(bucket_domain)
+
+                if domain is not None:
+                    current_requests, current_period = self._get_limits(domain)
+                    self.domain_limits[domain] = (
+                        current_requests if max_requests is None else max_requests,
+                        current_period if period is None else period)
+                else:
+                    if max_requests is not None:
+                        self.max_requests = max_requests
+
+                    if period is not None:
+                        self.period = period
+
+                for bucket_domain, bucket in self.buckets.items():
+                    bucket['tokens'] = min(bucket['tokens'], self._get_limits(bucket_domain)[0])
+            finally:
+                for lock in domain_locks:
+                    lock.release()
 
             logger.info(
-                f"Rate limiter updated: {self.max_requests} requests per {self.period} seconds")
+                "Rate limiter updated for %s: %d requests per %s seconds",
+                domain or 'default limits', *self._get_limits(domain))
 
 
 # Create a singleton instance
@@ -1,219 +1,437 @@
 """
 WebDriver pool implementation to efficiently manage and reuse WebDriver instances
 """
+import random
 import time
 import queue
 import threading
 import logging
-from typing import Optional, List, Dict, Any
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
-from selenium_stealth import stealth
+import weakref
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 
 from src.config import get_config
 
+# Selenium is only imported once a driver is actually created, since most pages
+# are fetched over plain HTTP and never need a browser
+if TYPE_CHECKING:
+    from selenium import webdriver
+
 logger = logging.getLogger(__name__)
 
+# Seconds between checks of the number of idle drivers against the min idle floor
+KEEP_WARM_INTERVAL = 0.5
+
+
+def _is_alive(driver: 'webdriver.Chrome') -> bool:
+    """
+    Check that a WebDriver's browser still answers.
+
+    session_id stays set after Chrome or chromedriver dies, so the current URL
+    is read, a single local round trip through chromedriver to the browser.
+
+    Args:
+        driver: WebDriver instance to check
+
+    Returns:
+        bool: True if the browser answered
+    """
+    if not getattr(driver, 'session_id', None):
+        return False
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+class _ThreadDriver:
+    """Holder for the driver checked out to one thread; it is freed when the thread exits."""
+    __slots__ = ('driver', 'release', '__weakref__')
+
 
 class WebDriverPool:
     """
     A pool of WebDriver instances that can be reused.
-    Implements the Singleton pattern to ensure only one pool exists.
-    """
-    _instance = None
-    _lock = threading.RLock()
 
-    def __new__(cls):
-        """Implement singleton pattern with thread safety."""
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(WebDriverPool, cls).__new__(cls)
-                cls._instance._initialized = False
-        return cls._instance
+    Idle drivers wait in a thread-safe queue and a bounded semaphore counts
+    the driver slots, so checking a driver out or back in takes no pool-wide
+    lock. A short lock only guards the bookkeeping of checked-out drivers, and
+    drivers are created, reset and quit outside it. A thread that renders many
+    pages can keep one driver for its whole lifetime with get_thread_driver,
+    skipping the pool entirely after the first checkout. With a min idle floor
+    configured, a background thread started by the first checkout starts
+    drivers ahead of demand so callers do not wait for Chrome to start.
+    One shared instance is created at import time and returned by get_webdriver_pool.
+    """
 
     def __init__(self):
         """Initialize the WebDriver pool."""
-        with self._lock:
-            if self._initialized:
-                return
-
-            self.config = get_config()
-            self.pool = queue.Queue()
-            self.active_drivers = set()
-            self.max_size = self.config.get('webdriver_pool_size', 3)
-            self.current_size = 0
-            self._initialized = True
-            logger.info(
-                f"WebDriver pool initialized with max size: {self.max_size}")
-
-    def get_driver(self, wait_timeout: int = 30) -> Optional[webdriver.Chrome]:
+        self.config = get_config()
+        self.pool = queue.Queue()
+        self.active_drivers: Dict[int, Any] = {}  # id(driver) -> checked-out driver
+        self.max_size = self.config.get('webdriver_pool_size', 3)
+        self._slots = threading.BoundedSemaphore(self.max_size)  # One per live driver
+        self._lock = threading.Lock()  # Guards active_drivers and _released_by
+        self._thread_local = threading.local()
+        self._released_by: Dict[int, int] = {}  # id(idle driver) -> thread that last used it
+        self._driver_settings: Optional[Dict[str, Any]] = None  # Built by the first _create_driver
+
+        # Keep min_idle drivers started in the background once the pool is first used
+        self.min_idle = min(self.config.get('webdriver_min_idle', 0), self.max_size)
+        self._closed = threading.Event()
+        self._warmer: Optional[threading.Thread] = None
+
+        logger.info(
+            "WebDriver pool initialized with max size: %d, min idle: %d", self.max_size, self.min_idle)
+
+    def get_driver(self, wait_timeout: int = 30) -> Optional['webdriver.Chrome']:
         """
         Get a WebDriver instance from the pool or create a new one if needed.
 
+        An idle driver is returned immediately, a new one is created while the
+        pool is below max size, and only a full pool waits for a release. Idle
+        drivers are reset when they are borrowed by a thread other than the one
+        that released them, not when they are released, and drivers whose
+        browser no longer answers are replaced.
+
         Args:
             wait_timeout: Maximum time to wait for an available driver
 
         Returns:
             WebDriver instance or None if none available
         """
-        with self._lock:
+        if self.min_idle > 0 and self._warmer is None:
+            self._start_warmer()
+
+        # Every idle driver may turn out dead, plus one attempt for a new driver
+        for _ in range(self.max_size + 1):
             try:
-                # Try to get a driver from the pool
-                driver = self.pool.get(block=True, timeout=wait_timeout)
+                driver = self.pool.get_nowait()
+                pooled = True
                 logger.debug("Retrieved WebDriver from pool")
-                self.active_drivers.add(driver)
-                return driver
             except queue.Empty:
-                # If pool is empty, create a new driver if below max size
-                if self.current_size < self.max_size:
-                    driver = self._create_driver()
-                    if driver:
-                        self.current_size += 1
-                        self.active_drivers.add(driver)
-                        logger.debug(
-                            f"Created new WebDriver, pool size: {self.current_size}")
-                        return driver
+                pooled = not self._slots.acquire(blocking=False)
+                if not pooled:
+                    driver = None
+                    try:
+                        driver = self._create_driver()
+                    finally:
+                        # Free the slot however creation failed
+                        if driver is None:
+                            self._slots.release()
+                    if driver is None:
+                        return None
+                    logger.debug("Created new WebDriver")
+                else:
+                    try:
+                        driver = self.pool.get(block=True, timeout=wait_timeout)
+                        logger.debug("Retrieved WebDriver from pool")
+                    except queue.Empty:
+                        logger.warning(
+                            "Could not get WebDriver: pool exhausted and at max size")
+                        return None
+
+            with self._lock:
+                self.active_drivers[id(driver)] = driver
+                released_by = self._released_by.pop(id(driver), None) if pooled else None
+
+            # A driver about to be reset is probed by the reset itself
+            needs_reset = released_by is not None and released_by != threading.get_ident()
+            if pooled and not needs_reset and not _is_alive(driver):
+                logger.warning("Discarding pooled WebDriver whose browser no longer answers")
+                self._close_driver(driver)
+                continue
 
-                logger.warning(
-                    "Could not get WebDriver: pool exhausted and at max size")
-                return None
+            if needs_reset:
+                try:
+                    # Clear cookies and state left by the previous thread
+                    driver.delete_all_cookies()
+                    driver.get("about:blank")
+                except Exception as e:
+                    logger.error("Error resetting WebDriver: %s", e)
+                    self._close_driver(driver)
+                    continue
+            return driver
+
+        logger.warning("Could not get a working WebDriver after %d attempts", self.max_size + 1)
+        return None
 
-    def release_driver(self, driver: webdriver.Chrome) -> None:
+    def release_driver(self, driver: 'webdriver.Chrome') -> None:
         """
         Release a WebDriver back to the pool.
 
+        The driver is not reset here; the next thread to borrow it resets it.
+
         Args:
             driver: WebDriver instance to release
         """
         with self._lock:
-            if driver in self.active_drivers:
-                try:
-                    # Clear cookies and reset state before returning to pool
-                    driver.delete_all_cookies()
-                    driver.get("about:blank")
+            tracked = self.active_drivers.pop(id(driver), None) is not None
+            if tracked:
+                self._released_by[id(driver)] = threading.get_ident()
 
-                    self.active_drivers.remove(driver)
-                    self.pool.put(driver)
-                    logger.debug("Released WebDriver back to pool")
-                except Exception as e:
-                    logger.error(f"Error releasing WebDriver: {str(e)}")
-                    self._close_driver(driver)
-            else:
-                logger.warning("Attempted to release untracked WebDriver")
+        if not tracked:
+            logger.warning("Attempted to release untracked WebDriver")
+            return
+
+        self.pool.put(driver)
+        logger.debug("Released WebDriver back to pool")
 
-    def _create_driver(self) -> Optional[webdriver.Chrome]:
+    def get_thread_driver(self, wait_timeout: int = 30) -> Optional['webdriver.Chrome']:
         """
-        Create a new WebDriver instance.
+        Get the WebDriver checked out to the calling thread.
+
+        The first call in a thread checks a driver out of the pool, and later
+        calls return the same driver without touching the pool or resetting
+        it. The driver is released back to the pool when the thread exits, or
+        earlier by release_thread_driver.
+
+        Args:
+            wait_timeout: Maximum time to wait for an available driver
 
         Returns:
-            New WebDriver instance or None if creation failed
+            WebDriver instance or None if none available
         """
-        try:
-            settings = self.config.get('webdriver_settings', {})
+        holder = getattr(self._thread_local, 'holder', None)
+        if holder is not None:
+            driver = holder.driver
+            if id(driver) in self.active_drivers and _is_alive(driver):
+                return driver
 
-            options = webdriver.ChromeOptions()
+            # The driver was closed by close_all or its browser died
+            self._thread_local.holder = None
+            holder.release.detach()
+            if id(driver) in self.active_drivers:
+                self._close_driver(driver)
 
-            if settings.get('headless', False):
-                options.add_argument("--headless")
+        driver = self.get_driver(wait_timeout)
+        if driver is None:
+            return None
 
-            if settings.get('no_sandbox', True):
-                options.add_argument("--no-sandbox")
+        holder = _ThreadDriver()
+        holder.driver = driver
+        holder.release = weakref.finalize(holder, self._release_if_active, driver)
+        holder.release.atexit = False
+        self._thread_local.holder = holder
+        return driver
+
+    def release_thread_driver(self) -> None:
+        """Release the WebDriver checked out to the calling thread, if any."""
+        holder = getattr(self._thread_local, 'holder', None)
+        if holder is not None:
+            self._thread_local.holder = None
+            holder.release()
+
+    def _release_if_active(self, driver: 'webdriver.Chrome') -> None:
+        """
+        Release a thread's WebDriver unless close_all has closed it already.
 
-            if settings.get('disable_dev_shm_usage', True):
-                options.add_argument("--disable-dev-shm-usage")
+        Args:
+            driver: WebDriver instance to release
+        """
+        if id(driver) in self.active_drivers:
+            self.release_driver(driver)
 
-            if settings.get('disable_blink_features', None):
-                options.add_argument(
-                    f"--disable-blink-features={settings['disable_blink_features']}")
+    def _start_warmer(self) -> None:
+        """
+        Start the thread keeping min_idle drivers started, unless it runs already or the pool is closed.
 
-            if settings.get('start_maximized', True):
-                options.add_argument("--start-maximized")
+        It is started by the first get_driver rather than with the pool, since
+        the pool is created whenever this module is imported.
+        """
+        with self._lock:
+            if self._warmer is not None or self._closed.is_set():
+                return
+            self._warmer = threading.Thread(
+                target=self._keep_warm, name='webdriver-warmer', daemon=True)
+            self._warmer.start()
+
+    def _keep_warm(self) -> None:
+        """Start drivers while fewer than min_idle are idle and the pool is below max size, until close_all."""
+        while not self._closed.is_set():
+            if self.pool.qsize() < self.min_idle and self._slots.acquire(blocking=False):
+                driver = None
+                try:
+                    driver = self._create_driver()
+                except Exception as e:
+                    logger.error("Error starting idle WebDriver: %s", e)
+                finally:
+                    if driver is None:
+                        self._slots.release()
+                if driver is not None:
+                    self.pool.put(driver)
+                    logger.debug("Started idle WebDriver ahead of demand")
+                    continue
+            self._closed.wait(KEEP_WARM_INTERVAL)
 
-            if settings.get('disable_notifications', True):
-                options.add_argument("--disable-notifications")
+    def _get_driver_settings(self) -> Dict[str, Any]:
+        """
+        Get the Chrome options and stealth settings every new driver uses.
 
-            if settings.get('disable_popup_blocking', True):
-                options.add_argument("--disable-popup-blocking")
+        They are built from the config when the first driver is created rather
+        than when the pool is, since the pool is created at import time and the
+        config (e.g. --headless) may still be changed before any driver starts.
 
+        Returns:
+            dict: Chrome arguments, Chrome prefs, stealth kwargs, page load timeout and create retries
+        """
+        if self._driver_settings is not None:
+            return self._driver_settings
+
+        settings = self.config.get('webdriver_settings', {})
+
+        arguments = []
+        if settings.get('headless', False):
+            arguments.append("--headless")
+        if settings.get('no_sandbox', True):
+            arguments.append("--no-sandbox")
+        if settings.get('disable_dev_shm_usage', True):
+            arguments.append("--disable-dev-shm-usage")
+        if settings.get('disable_blink_features', None):
+            arguments.append(f"--disable-blink-features={settings['disable_blink_features']}")
+        if settings.get('start_maximized', True):
+            arguments.append("--start-maximized")
+        if settings.get('disable_notifications', True):
+            arguments.append("--disable-notifications")
+        if settings.get('disable_popup_blocking', True):
+            arguments.append("--disable-popup-blocking")
+
+        # Block content the scrapers never read
+        content_settings = {}
+        if settings.get('disable_images', False):
+            arguments.append("--blink-settings=imagesEnabled=false")
+            content_settings["profile.managed_default_content_settings.images"] = 2
+        if settings.get('disable_stylesheets', False):
+            content_settings["profile.managed_default_content_settings.stylesheets"] = 2
+
+        # Add user agent
+        user_agent = settings.get('user_agent', '')
+        if user_agent:
+            arguments.append(f"user-agent={user_agent}")
+
+        stealth_settings = settings.get('stealth_settings', {})
+        stealth_kwargs = {
+            'languages': stealth_settings.get('languages', ["en-US", "en"]),
+            'vendor': stealth_settings.get('vendor', "Google Inc."),
+            'platform': stealth_settings.get('platform', "Win32"),
+            'webgl_vendor': stealth_settings.get('webgl_vendor', "Intel Inc."),
+            'renderer': stealth_settings.get('renderer', "Intel Iris OpenGL Engine"),
+            'fix_hairline': stealth_settings.get('fix_hairline', True)
+        } if stealth_settings else None
+
+        self._driver_settings = {
+            'arguments': arguments,
+            'prefs': content_settings,
+            'stealth': stealth_kwargs,
+            'page_load_timeout': self.config.get('page_load_timeout', 30),
+            'create_retries': max(1, self.config.get('driver_create_retries', 3))
+        }
+        return self._driver_settings
+
+    def _create_driver(self) -> Optional['webdriver.Chrome']:
+        """
+        Create a new WebDriver instance.
+
+        Chrome startup intermittently fails when several drivers launch at once
+        (e.g. port races), so creation is retried with jittered exponential backoff.
+
+        Returns:
+            New WebDriver instance or None if creation failed
+        """
+        from selenium import webdriver
+        from selenium.common.exceptions import WebDriverException
+        from selenium_stealth import stealth
+
+        settings = self._get_driver_settings()
+        create_retries = settings['create_retries']
+        try:
+            options = webdriver.ChromeOptions()
+            for argument in settings['arguments']:
+                options.add_argument(argument)
+            if settings['prefs']:
+                options.add_experimental_option("prefs", settings['prefs'])
             options.add_experimental_option(
                 "excludeSwitches", ["enable-automation"])
             options.add_experimental_option('useAutomationExtension', False)
 
-            # Add user agent
-            user_agent = settings.get('user_agent', '')
-            if user_agent:
-                options.add_argument(f"user-agent={user_agent}")
-
             # Create the WebDriver
-            driver = webdriver.Chrome(options=options)
+            for attempt in range(create_retries):
+                try:
+                    driver = webdriver.Chrome(options=options)
+                    break
+                except WebDriverException as e:
+                    if attempt == create_retries - 1:
+                        raise
+                    delay = 0.1 * (2 ** attempt) + random.uniform(0, 0.05)
+                    logger.warning(
+                        "WebDriver creation attempt %d failed: %s. Retrying in %.2f seconds",
+                        attempt + 1, e, delay)
+                    time.sleep(delay)
 
             # Apply stealth settings
-            stealth_settings = settings.get('stealth_settings', {})
-            if stealth_settings:
-                stealth(
-                    driver,
-                    languages=stealth_settings.get(
-                        'languages', ["en-US", "en"]),
-                    vendor=stealth_settings.get('vendor', "Google Inc."),
-                    platform=stealth_settings.get('platform', "Win32"),
-                    webgl_vendor=stealth_settings.get(
-                        'webgl_vendor', "Intel Inc."),
-                    renderer=stealth_settings.get(
-                        'renderer', "Intel Iris OpenGL Engine"),
-                    fix_hairline=stealth_settings.get('fix_hairline', True)
-                )
+            if settings['stealth']:
+                stealth(driver, **settings['stealth'])
 
             # Set page load timeout
-            timeout = self.config.get('page_load_timeout', 30)
-            driver.set_page_load_timeout(timeout)
+            driver.set_page_load_timeout(settings['page_load_timeout'])
 
             return driver
 
         except WebDriverException as e:
-            logger.error(f"Error creating WebDriver: {str(e)}")
+            logger.error("Error creating WebDriver: %s", e)
             return None
 
-    def _close_driver(self, driver: webdriver.Chrome) -> None:
+    def _close_driver(self, driver: 'webdriver.Chrome') -> None:
         """
-        Close a WebDriver instance and update pool size.
+        Close a WebDriver instance and free its slot.
 
         Args:
             driver: WebDriver instance to close
         """
-        with self._lock:
-            try:
-                if driver in self.active_drivers:
-                    self.active_drivers.remove(driver)
-
-                driver.quit()
-                self.current_size -= 1
-                logger.debug(
-                    f"Closed WebDriver, pool size: {self.current_size}")
-            except Exception as e:
-                logger.error(f"Error closing WebDriver: {str(e)}")
-                # Ensure we decrement the count even if there's an error
-                self.current_size = max(0, self.current_size - 1)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error("Error closing WebDriver: %s", e)
+        finally:
+            # Free the slot even if quitting failed
+            with self._lock:
+                self.active_drivers.pop(id(driver), None)
+                self._released_by.pop(id(driver), None)
+            self._slots.release()
+            logger.debug("Closed WebDriver")
 
     def close_all(self) -> None:
-        """Close all WebDriver instances in the pool."""
+        """Close all WebDriver instances in the pool and stop starting idle ones."""
+        # Stop the warmer first so it cannot add drivers while the pool is drained
+        self._closed.set()
         with self._lock:
-            # Close active drivers
-            active_drivers = list(self.active_drivers)
-            for driver in active_drivers:
-                self._close_driver(driver)
+            warmer = self._warmer
+        if warmer is not None:
+            warmer.join()
 
-            # Close drivers in the pool
-            while not self.pool.empty():
-                try:
-                    driver = self.pool.get(block=False)
-                    driver.quit()
-                    self.current_size -= 1
-                except Exception as e:
-                    logger.error(f"Error closing pooled WebDriver: {str(e)}")
+        # Close active drivers
+        with self._lock:
+            active_drivers = list(self.active_drivers.values())
+        for driver in active_drivers:
+            self._close_driver(driver)
+
+        # Close drivers in the pool
+        while True:
+            try:
+                driver = self.pool.get(block=False)
+            except queue.Empty:
+                break
+            self._close_driver(driver)
+
+        logger.info("Closed all WebDrivers in pool")
+
+    def __enter__(self) -> 'WebDriverPool':
+        """Use the pool as a context manager that closes all drivers on exit."""
+        return self
 
-            self.current_size = 0
-            logger.info("Closed all WebDrivers in pool")
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close all WebDrivers when leaving the context."""
+        self.close_all()
 
 
 # Create a singleton instance
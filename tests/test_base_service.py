@@ -0,0 +1,188 @@
+"""
+Unit tests for the BaseService class
+"""
+from concurrent.futures import ThreadPoolExecutor
+from src.services.base_service import BaseService, keep_thread_driver
+from src.utils.webdriver_pool import WebDriverPool
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestBaseService(unittest.TestCase):
+    """Test cases for BaseService."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.service = BaseService()
+        self.service.page_cache = MagicMock()
+        self.service.page_cache.get.return_value = None
+        self.service.page_cache.get_entry.return_value = None
+        self.service.rate_limiter = MagicMock()
+        self.service.session = MagicMock()
+        self.url = 'https://fbref.com/en/squads/822bd0ba/Liverpool-Stats'
+
+    def test_get_page_uncomments_tables(self):
+        """Test that tables hidden in HTML comments are exposed."""
+        self.service.session.get.return_value = MagicMock(
+            status_code=200,
+            headers={'ETag': '"abc"', 'Last-Modified': 'Sat, 01 Feb 2025 12:00:00 GMT'},
+            text='<!-- ad slot --><div><!--\n<table id="stats_shooting_9"></table>\n--></div>')
+        self.service._fetch_with_webdriver = MagicMock()
+
+        page = self.service.get_page_with_rate_limit(
+            self.url, domain='fbref', required_id='stats_shooting_9')
+
+        # Assertions
+        self.assertIn('<div>\n<table id="stats_shooting_9"></table>\n</div>', page)
+        self.assertIn('<!-- ad slot -->', page)
+        self.service._fetch_with_webdriver.assert_not_called()
+        self.service.page_cache.set.assert_called_once_with(
+            self.url, page, etag='"abc"', last_modified='Sat, 01 Feb 2025 12:00:00 GMT')
+
+    def test_get_page_falls_back_to_webdriver(self):
+        """Test WebDriver fallback when the required element is missing."""
+        self.service.session.get.return_value = MagicMock(
+            status_code=200, headers={}, text='<html></html>')
+        self.service._fetch_with_webdriver = MagicMock(
+            return_value='<table id="stats_standard_9"></table>')
+
+        page = self.service.get_page_with_rate_limit(
+            self.url, domain='fbref', required_id='stats_standard_9')
+
+        # Assertions
+        self.assertEqual(page, '<table id="stats_standard_9"></table>')
+        self.service._fetch_with_webdriver.assert_called_once_with(
+            self.url, 'fbref', 'stats_standard_9')
+
+    def test_fetch_with_webdriver_waits_for_required_element(self):
+        """Test that the WebDriver fallback waits for the required element by ID."""
+        driver = MagicMock(page_source='<table id="stats_standard_9"></table>')
+        self.service.webdriver_pool = MagicMock()
+        self.service.webdriver_pool.get_thread_driver.return_value = driver
+
+        page = self.service._fetch_with_webdriver(
+            self.url, 'fbref', 'stats_standard_9')
+
+        # Assertions
+        self.assertEqual(page, '<table id="stats_standard_9"></table>')
+        driver.get.assert_called_once_with(self.url)
+        driver.find_element.assert_called_with('id', 'stats_standard_9')
+
+        # The main thread is not a fetch worker, so it hands the driver back
+        self.service.webdriver_pool.release_thread_driver.assert_called_once()
+
+    def test_get_page_not_cached_when_required_element_never_renders(self):
+        """Test that a rendered page missing the required element is neither returned nor cached."""
+        self.service.session.get.return_value = MagicMock(
+            status_code=200, headers={}, text='<html></html>')
+        self.service.webdriver_pool = MagicMock()
+        self.service.webdriver_pool.get_thread_driver.return_value = MagicMock(page_source='<html></html>')
+        self.service._wait_for_element_id = MagicMock(return_value=False)
+
+        page = self.service.get_page_with_rate_limit(
+            self.url, domain='fbref', required_id='stats_standard_9')
+
+        # Assertions
+        self.assertIsNone(page)
+        self.service.page_cache.set.assert_not_called()
+
+    def test_fetch_workers_keep_drivers_while_main_thread_fetches(self):
+        """Test that a driver used by the main thread does not hold up a full set of fetch workers."""
+        with patch.dict(self.service.config._config_data, {'webdriver_pool_size': 2}):
+            pool = WebDriverPool()
+        self.addCleanup(pool.close_all)
+        pool._create_driver = MagicMock(side_effect=lambda: MagicMock(page_source='<html></html>'))
+        self.service.webdriver_pool = pool
+        barrier = threading.Barrier(2)
+
+        def fetch(url):
+            page = self.service._fetch_with_webdriver(url)
+            # Both workers hold their driver at once
+            barrier.wait(timeout=5)
+            return page
+
+        self.assertEqual(self.service._fetch_with_webdriver(self.url), '<html></html>')
+        with ThreadPoolExecutor(max_workers=2, initializer=keep_thread_driver) as executor:
+            pages = list(executor.map(fetch, [self.url] * 2))
+
+        # Assertions
+        self.assertEqual(pages, ['<html></html>'] * 2)
+        self.assertEqual(pool._create_driver.call_count, 2)
+
+    def test_get_page_not_modified(self):
+        """Test that a 304 response is answered from the page cache."""
+        entry = {'fetched_at': 1735732800.0, 'etag': '"abc"',
+                 'last_modified': 'Wed, 01 Jan 2025 12:00:00 GMT', 'sha256': '0' * 64}
+        self.service.page_cache.get_entry.return_value = entry
+        self.service.page_cache.load.return_value = '<html>cached</html>'
+        self.service.session.get.return_value = MagicMock(status_code=304)
+
+        page = self.service.get_page_with_rate_limit(self.url, domain='fbref')
+
+        # Assertions
+        self.assertEqual(page, '<html>cached</html>')
+        self.assertEqual(
+            self.service.session.get.call_args.kwargs['headers'],
+            {'If-None-Match': '"abc"', 'If-Modified-Since': 'Wed, 01 Jan 2025 12:00:00 GMT'})
+        self.service.page_cache.load.assert_called_once_with(self.url, entry)
+        self.service.page_cache.set.assert_called_once_with(
+            self.url, page, etag='"abc"', last_modified='Wed, 01 Jan 2025 12:00:00 GMT')
+
+    def test_get_page_from_cache(self):
+        """Test that cached pages skip fetching entirely."""
+        self.service.page_cache.get.return_value = '<html>cached</html>'
+
+        page = self.service.get_page_with_rate_limit(self.url, domain='fbref')
+
+        # Assertions
+        self.assertEqual(page, '<html>cached</html>')
+        self.service.session.get.assert_not_called()
+
+    def test_get_parsed_page_refetches_page_missing_required_element(self):
+        """Test that a cached page without the required element is fetched again."""
+        self.service.page_cache.get.return_value = '<html><table id="results"></table></html>'
+        self.service.session.get.return_value = MagicMock(
+            status_code=200, headers={}, text='<html><table id="stats_standard_9"></table></html>')
+
+        root = self.service.get_parsed_page(self.url, domain='fbref', required_id='stats_standard_9')
+
+        # Assertions
+        self.assertIsNotNone(root.get_element_by_id('stats_standard_9', None))
+        self.service.session.get.assert_called_once()
+
+    def test_get_page_bypasses_cache(self):
+        """Test that a forced refresh fetches the page despite a cache hit."""
+        self.service.page_cache.get.return_value = '<html>cached</html>'
+        self.service.session.get.return_value = MagicMock(
+            status_code=200, headers={}, text='<html>fresh</html>')
+
+        page = self.service.get_page_with_rate_limit(
+            self.url, domain='fbref', bypass_cache=True)
+
+        # Assertions
+        self.assertEqual(page, '<html>fresh</html>')
+        self.service.page_cache.get.assert_not_called()
+
+
+    def test_get_parsed_page_evicts_expired_and_oldest_pages(self):
+        """Test that parsed pages are dropped once expired or over the size limit."""
+        self.service.get_page_with_rate_limit = MagicMock(return_value='<html><body></body></html>')
+        urls = [f'{self.url}?page={i}' for i in range(3)]
+
+        with patch.dict(self.service.config._config_data, {'parsed_page_cache_size': 2}):
+            for url in urls:
+                self.service.get_parsed_page(url, ttl=300)
+            self.assertEqual(list(self.service._parsed_pages), urls[1:])
+
+            with patch('src.services.base_service.time.monotonic', return_value=time.monotonic() + 600):
+                self.service.get_parsed_page(urls[0], ttl=300)
+
+        # Assertions
+        self.assertEqual(list(self.service._parsed_pages), urls[:1])
+        self.assertEqual(self.service.get_page_with_rate_limit.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
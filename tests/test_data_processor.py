@@ -0,0 +1,104 @@
+"""
+Unit tests for the DataProcessor class
+"""
+from src.data_preparation.data_processor import DataProcessor
+import unittest
+import os
+import pandas as pd
+import tempfile
+
+
+class TestDataProcessor(unittest.TestCase):
+    """Test cases for DataProcessor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.temp_dir.name, 'teams'))
+        os.makedirs(os.path.join(self.temp_dir.name, 'standings'))
+        self.processor = DataProcessor(self.temp_dir.name)
+
+        self.team_data = {
+            '822bd0ba_20250407.json': {
+                'players': {
+                    'Mohamed Salah': {
+                        'url': 'https://fbref.com/en/players/e342ad68/Mohamed-Salah',
+                        'stats': {
+                            'player': 'Mohamed Salah',
+                            'nationality': 'eg EGY',
+                            'position': 'FW',
+                            'age': '32-289',
+                            'minutes': '2,700',
+                            'goals': '27',
+                            'xg': '22.4'
+                        },
+                        'possession_stats': {
+                            'take_ons_won_pct': '45.5%',
+                            'carries': ''
+                        }
+                    },
+                    'Alisson': {
+                        'url': 'https://fbref.com/en/players/7a2e46a8/Alisson',
+                        'stats': {
+                            'player': 'Alisson',
+                            'position': 'GK',
+                            'minutes': '2,250',
+                            'goals': '0',
+                            'xg': '-'
+                        }
+                    }
+                }
+            }
+        }
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def test_process_player_stats(self):
+        """Test conversion of player statistics."""
+        players_df = self.processor.process_player_stats(self.team_data)
+
+        # Assertions
+        self.assertEqual(len(players_df), 2)
+        salah = players_df.set_index('player_name').loc['Mohamed Salah']
+        self.assertEqual(salah['team_id'], '822bd0ba')
+        self.assertEqual(salah['nationality'], 'EGY')
+        self.assertEqual(salah['stat_minutes'], 2700.0)
+        self.assertEqual(salah['stat_goals'], 27.0)
+        self.assertEqual(salah['stat_xg'], 22.4)
+        self.assertAlmostEqual(salah['possession_take_ons_won_pct'], 0.455)
+        self.assertTrue(salah.isna()['possession_carries'])
+
+        alisson = players_df.set_index('player_name').loc['Alisson']
+        self.assertEqual(alisson['stat_goals'], 0.0)
+        self.assertTrue(alisson.isna()['stat_xg'])
+        self.assertTrue(alisson.isna()['possession_take_ons_won_pct'])
+
+    def test_process_team_matches(self):
+        """Test conversion of match stats and dates."""
+        team_data = {
+            '822bd0ba_20250407.json': {
+                'matches': [
+                    {'date': '2024-08-17', 'comp': 'Premier League', 'goals_for': '2',
+                     'goals_against': '0', 'xg_for': '2.1', 'possession': '62', 'attendance': '25,194'},
+                    {'date': '2024-08-25', 'comp': 'Premier League', 'goals_for': '2',
+                     'goals_against': '0', 'xg_for': '', 'possession': '66'}
+                ]
+            }
+        }
+
+        matches_df = self.processor.process_team_matches(team_data)
+
+        # Assertions
+        self.assertEqual(len(matches_df), 2)
+        self.assertEqual(matches_df['date'].iloc[0], pd.Timestamp(2024, 8, 17))
+        self.assertEqual(matches_df['goals_for'].tolist(), [2.0, 2.0])
+        self.assertEqual(matches_df['xg_for'].iloc[0], 2.1)
+        self.assertTrue(pd.isna(matches_df['xg_for'].iloc[1]))
+        self.assertEqual(matches_df['attendance'].iloc[0], 25194.0)
+        self.assertTrue(pd.isna(matches_df['attendance'].iloc[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Unit tests for the FileManager class
+"""
+from src.utils.file_manager import FileManager
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+
+class TestFileManager(unittest.TestCase):
+    """Test cases for FileManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_manager = FileManager(self.temp_dir.name, compress=False)
+        self.data = {
+            'name': 'Atlético Madrid',
+            'players': {'Julián Álvarez': {'stats': {'goals': '17'}}}
+        }
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def test_save_and_load(self):
+        """Test that saved data is written as indented JSON and loads back."""
+        filepath = self.file_manager.save_data(self.data, 'team.json', 'teams')
+
+        with open(filepath, encoding='utf-8') as f:
+            content = f.read()
+
+        # Assertions
+        self.assertEqual(content, json.dumps(self.data, indent=2, ensure_ascii=False))
+        self.assertEqual(self.file_manager.load_data('team.json', 'teams'), self.data)
+
+    def test_save_and_load_compressed(self):
+        """Test round trip through zstd-compressed files."""
+        file_manager = FileManager(self.temp_dir.name, compress=True)
+        filepath = file_manager.save_data(self.data, 'team.json', 'teams')
+
+        # Assertions
+        self.assertTrue(filepath.endswith('.json.zst'))
+        self.assertEqual(file_manager.load_data('team', 'teams'), self.data)
+
+    def test_save_backs_up_only_changed_data(self):
+        """Test that the previous file is backed up on change and identical saves are skipped."""
+        filepath = self.file_manager.save_data(self.data, 'team.json', 'teams')
+        backup_dir = os.path.join(self.temp_dir.name, 'data', 'teams', 'backups')
+
+        self.file_manager.save_data(self.data, 'team.json', 'teams')
+        self.assertFalse(os.path.exists(backup_dir))
+
+        self.file_manager.save_data({**self.data, 'name': 'Real Madrid'}, 'team.json', 'teams')
+
+        # Assertions
+        backups = os.listdir(backup_dir)
+        self.assertEqual(len(backups), 1)
+        with open(os.path.join(backup_dir, backups[0]), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), self.data)
+        self.assertEqual(self.file_manager.load_data('team.json', 'teams')['name'], 'Real Madrid')
+        self.assertFalse([name for name in os.listdir(os.path.dirname(filepath)) + backups
+                          if name.endswith('.tmp')])
+
+
+    def test_interrupted_save_does_not_skip_next_save(self):
+        """Test that a save interrupted before its hash is written does not leave the old hash."""
+        self.file_manager.save_data(self.data, 'team.json', 'teams')
+        changed = {**self.data, 'name': 'Real Madrid'}
+
+        with patch('src.utils.file_manager.Path.write_text', side_effect=OSError('disk full')):
+            self.assertIsNone(self.file_manager.save_data(changed, 'team.json', 'teams'))
+        self.assertEqual(self.file_manager.load_data('team.json', 'teams'), changed)
+
+        self.file_manager.save_data(self.data, 'team.json', 'teams')
+
+        # Assertions
+        self.assertEqual(self.file_manager.load_data('team.json', 'teams'), self.data)
+
+
+    def test_concurrent_saves_of_same_file(self):
+        """Test that threads saving the same file at once do not clobber each other's writes."""
+        versions = [{**self.data, 'version': i} for i in range(8)]
+        self.file_manager.save_data(self.data, 'team.json', 'teams')
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda data: self.file_manager.save_data(data, 'team.json', 'teams'), versions))
+
+        # Assertions
+        self.assertNotIn(None, results)
+        self.assertIn(self.file_manager.load_data('team.json', 'teams'), versions)
+
+
+    def test_load_prefers_newer_of_plain_and_compressed(self):
+        """Test that the latest save is loaded after compression is switched off."""
+        compressed_manager = FileManager(self.temp_dir.name, compress=True)
+        compressed_path = compressed_manager.save_data(self.data, 'team.json', 'teams')
+        os.utime(compressed_path, (946684800, 946684800))
+
+        self.file_manager.save_data({**self.data, 'name': 'Real Madrid'}, 'team.json', 'teams')
+
+        # Assertions
+        self.assertEqual(self.file_manager.load_data('team.json', 'teams')['name'], 'Real Madrid')
+        self.assertEqual(compressed_manager.load_data('team.json', 'teams')['name'], 'Real Madrid')
+
+
+if __name__ == '__main__':
+    unittest.main()
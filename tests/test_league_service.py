@@ -0,0 +1,112 @@
+"""
+Unit tests for the LeagueService class
+"""
+from src.services.league_service import LeagueService
+import unittest
+from unittest.mock import patch
+
+
+TEAM_STATS_PAGE = """
+<table id="stats_squads_standard_for">
+    <tbody>
+        <tr>
+            <th data-stat="team"><a href="/en/squads/822bd0ba/Liverpool-Stats">Liverpool</a></th>
+            <td data-stat="players_used">25</td>
+            <td data-stat="possession">61.5</td>
+            <td data-stat="minutes">3,420</td>
+            <td data-stat="goals">86</td>
+            <td data-stat="goals_pens">-</td>
+        </tr>
+    </tbody>
+</table>
+"""
+
+STANDINGS_PAGE = """
+<table id="results2024-202591_overall">
+    <tbody>
+        <tr>
+            <th data-stat="rank">1</th>
+            <td data-stat="team"><img src="logo.png"> <a href="/en/squads/822bd0ba/Liverpool-Stats">Liverpool</a></td>
+            <td data-stat="wins">25</td>
+            <td data-stat="ties">9</td>
+            <td data-stat="losses">4</td>
+            <td data-stat="points">84</td>
+            <td data-stat="">ignored</td>
+        </tr>
+    </tbody>
+</table>
+"""
+
+
+class TestLeagueService(unittest.TestCase):
+    """Test cases for LeagueService."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.league_service = LeagueService()
+
+    @patch('src.services.league_service.LeagueService.save_data_with_retry')
+    @patch('src.services.league_service.LeagueService.get_page_with_rate_limit')
+    def test_get_league_standings(self, mock_get_page, mock_save):
+        """Test extraction of the league standings."""
+        mock_get_page.return_value = STANDINGS_PAGE
+        mock_save.return_value = True
+
+        standings = self.league_service.get_league_standings()
+
+        # Assertions
+        self.assertEqual(len(standings), 1)
+        self.assertEqual(standings[0]['rank'], '1')
+        self.assertEqual(standings[0]['team'], 'Liverpool')
+        self.assertEqual(standings[0]['points'], '84')
+        self.assertEqual(standings[0]['draws'], '9')
+        self.assertEqual(
+            standings[0]['url'], 'https://fbref.com/en/squads/822bd0ba/Liverpool-Stats')
+        self.assertEqual(standings[0]['team_id'], '822bd0ba')
+        self.assertNotIn('', standings[0])
+
+    @patch('src.services.league_service.LeagueService.save_data_with_retry')
+    @patch('src.services.league_service.LeagueService.get_page_with_rate_limit')
+    def test_get_team_stats_numeric_values(self, mock_get_page, mock_save):
+        """Test conversion of numeric team statistics."""
+        mock_get_page.return_value = TEAM_STATS_PAGE
+        mock_save.return_value = True
+
+        stats = self.league_service.get_team_stats()
+
+        # Assertions
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['team'], 'Liverpool')
+        self.assertEqual(stats[0]['players_used'], 25)
+        self.assertEqual(stats[0]['possession'], 61.5)
+        self.assertEqual(stats[0]['minutes'], 3420)
+        self.assertEqual(stats[0]['goals_pens'], '-')
+        self.assertEqual(stats[0]['xg'], 0)
+
+    @patch('src.services.league_service.LeagueService.save_data_with_retry')
+    @patch('src.services.league_service.LeagueService.get_page_with_rate_limit')
+    def test_get_league_summary_parses_page_once(self, mock_get_page, mock_save):
+        """Test that standings and team statistics share one parsed page."""
+        mock_get_page.return_value = f'<div>{STANDINGS_PAGE}{TEAM_STATS_PAGE}</div>'
+        mock_save.return_value = True
+
+        summary = self.league_service.get_league_summary()
+
+        # Assertions
+        self.assertEqual(summary['standings'][0]['team'], 'Liverpool')
+        self.assertEqual(summary['team_stats'][0]['goals'], 86)
+        mock_get_page.assert_called_once()
+
+    @patch('src.services.league_service.LeagueService.get_page_with_rate_limit')
+    def test_get_team_stats_failure(self, mock_get_page):
+        """Test failure to load the team statistics page."""
+        mock_get_page.return_value = None
+
+        stats = self.league_service.get_team_stats()
+
+        # Assertions
+        self.assertIsNone(stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
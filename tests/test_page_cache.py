@@ -0,0 +1,98 @@
+"""
+Unit tests for the PageCache class
+"""
+from src.utils.page_cache import PageCache
+import unittest
+import os
+import tempfile
+
+
+class TestPageCache(unittest.TestCase):
+    """Test cases for PageCache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.page_cache = PageCache(self.temp_dir.name)
+        self.page_cache.enabled = True
+        self.url = 'https://fbref.com/en/squads/822bd0ba/Liverpool-Stats'
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def test_set_and_get(self):
+        """Test that a freshly stored page is served from the cache."""
+        self.page_cache.set(self.url, '<html>page</html>', etag='"abc"',
+                            last_modified='Sat, 01 Feb 2025 12:00:00 GMT')
+
+        # Assertions
+        self.assertEqual(self.page_cache.get(self.url), '<html>page</html>')
+        entry = self.page_cache.get_entry(self.url)
+        self.assertEqual(entry['etag'], '"abc"')
+        self.assertEqual(entry['last_modified'], 'Sat, 01 Feb 2025 12:00:00 GMT')
+        self.assertIsNone(self.page_cache.get('https://fbref.com/other'))
+
+    def test_stale_entry(self):
+        """Test that entries older than the TTL are only available for revalidation."""
+        self.page_cache.set(self.url, '<html>page</html>', etag='"abc"')
+        meta_path = self.page_cache._get_meta_path(self.url)
+        meta_path.write_text(meta_path.read_text().replace(
+            str(self.page_cache.get_entry(self.url)['fetched_at']), '946684800.0'))
+
+        # Assertions
+        self.assertIsNone(self.page_cache.get(self.url))
+        self.assertEqual(self.page_cache.load(self.url), '<html>page</html>')
+
+    def test_unchanged_page_is_stored_once(self):
+        """Test that identical page sources share one stored body."""
+        self.page_cache.set(self.url, '<html>page</html>')
+        self.page_cache.set('https://fbref.com/other', '<html>page</html>')
+
+        bodies = list(self.page_cache.cache_dir.glob(f"*{self.page_cache._suffix}"))
+
+        # Assertions
+        self.assertEqual(len(bodies), 1)
+
+    def test_set_and_get_parsed(self):
+        """Test round trip of a parsed result."""
+        data = {'name': 'Liverpool', 'players': {'Alisson': {'position': 'GK'}}}
+        self.assertIsNone(self.page_cache.get_parsed('team_stats_abc'))
+
+        self.page_cache.set_parsed('team_stats_abc', data)
+
+        # Assertions
+        self.assertEqual(self.page_cache.get_parsed('team_stats_abc'), data)
+
+
+    def test_prune_removes_unused_parsed_entries(self):
+        """Test that parse results not used within the max age are pruned."""
+        self.page_cache.set_parsed('old', {'players': {}})
+        self.page_cache.set_parsed('recent', {'players': {}})
+        old_path = self.page_cache.cache_dir / f"old{self.page_cache._parsed_suffix}"
+        os.utime(old_path, (946684800, 946684800))
+
+        # Assertions
+        self.assertEqual(self.page_cache.prune(parsed_max_age=60), 1)
+        self.assertIsNone(self.page_cache.get_parsed('old'))
+        self.assertEqual(self.page_cache.get_parsed('recent'), {'players': {}})
+
+
+    def test_prune_removes_unreferenced_bodies(self):
+        """Test that expired pages and bodies no page refers to any more are pruned."""
+        self.page_cache.set(self.url, '<html>old</html>')
+        old_body = self.page_cache._get_body_path(self.page_cache.get_entry(self.url)['sha256'])
+        self.page_cache.set(self.url, '<html>new</html>')
+        self.page_cache.set('https://fbref.com/other', '<html>other</html>')
+
+        # Assertions
+        self.assertEqual(self.page_cache.prune(), 1)
+        self.assertFalse(old_body.exists())
+        self.assertEqual(self.page_cache.load(self.url), '<html>new</html>')
+
+        self.assertEqual(self.page_cache.prune(max_age=0), 4)
+        self.assertEqual(list(self.page_cache.cache_dir.iterdir()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
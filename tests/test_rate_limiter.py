@@ -0,0 +1,87 @@
+"""
+Unit tests for the RateLimiter class
+"""
+from src.utils.rate_limiter import get_rate_limiter
+import unittest
+from unittest.mock import patch
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rate_limiter = get_rate_limiter()
+        self.limits = (self.rate_limiter.max_requests, self.rate_limiter.period)
+        self.domain_limits = dict(self.rate_limiter.domain_limits)
+        self.rate_limiter.update_limits(max_requests=2, period=10)
+        self.rate_limiter.buckets.clear()
+        self.now = 1000.0
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.rate_limiter.update_limits(*self.limits)
+        self.rate_limiter.domain_limits = self.domain_limits
+        self.rate_limiter.buckets.clear()
+
+    def _sleep(self, seconds):
+        """Advance the fake monotonic clock instead of sleeping."""
+        self.now += seconds
+
+    def test_burst_then_wait(self):
+        """Test that a full bucket admits a burst and then waits for a refill."""
+        with patch('src.utils.rate_limiter.time.monotonic', side_effect=lambda: self.now), \
+                patch('src.utils.rate_limiter.time.sleep', side_effect=self._sleep) as mock_sleep:
+            self.rate_limiter.wait_if_needed('fbref')
+            self.rate_limiter.wait_if_needed('fbref')
+            mock_sleep.assert_not_called()
+
+            self.rate_limiter.wait_if_needed('fbref')
+
+            # Assertions
+            mock_sleep.assert_called_once()
+            self.assertAlmostEqual(mock_sleep.call_args.args[0], 5.0)
+            self.assertEqual(self.rate_limiter.get_remaining_quota('fbref'), 0)
+
+    def test_domains_are_limited_separately(self):
+        """Test that each domain has its own bucket."""
+        with patch('src.utils.rate_limiter.time.monotonic', side_effect=lambda: self.now):
+            self.rate_limiter.wait_if_needed('fbref')
+            self.rate_limiter.wait_if_needed('fbref')
+
+            # Assertions
+            self.assertEqual(self.rate_limiter.get_remaining_quota('fbref'), 0)
+            self.assertEqual(self.rate_limiter.get_remaining_quota('default'), 2)
+
+    def test_domain_limits(self):
+        """Test that a domain with its own limits is throttled by them."""
+        self.rate_limiter.update_limits(max_requests=1, period=4, domain='fbref')
+
+        with patch('src.utils.rate_limiter.time.monotonic', side_effect=lambda: self.now), \
+                patch('src.utils.rate_limiter.time.sleep', side_effect=self._sleep) as mock_sleep:
+            self.rate_limiter.wait_if_needed('fbref')
+            self.rate_limiter.wait_if_needed('fbref')
+
+            # Assertions
+            mock_sleep.assert_called_once()
+            self.assertAlmostEqual(mock_sleep.call_args.args[0], 4.0)
+            self.assertEqual(self.rate_limiter.get_remaining_quota('default'), 2)
+
+
+    def test_update_limits_with_existing_buckets(self):
+        """Test that updating limits while buckets exist changes only the requested limits."""
+        with patch('src.utils.rate_limiter.time.monotonic', side_effect=lambda: self.now):
+            self.rate_limiter.wait_if_needed('fbref')
+            self.rate_limiter.wait_if_needed('understat')
+
+            self.rate_limiter.update_limits(max_requests=3)
+            self.rate_limiter.update_limits(max_requests=5, domain='fbref')
+
+            # Assertions
+            self.assertEqual((self.rate_limiter.max_requests, self.rate_limiter.period), (3, 10))
+            self.assertEqual(self.rate_limiter.domain_limits.get('fbref'), (5, 10))
+            self.assertNotIn('understat', self.rate_limiter.domain_limits)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,30 +1,28 @@
 """
 Unit tests for the TeamService class
 """
-from services.team_service import TeamService
+from src.services.team_service import TeamService
 import unittest
-from unittest.mock import patch, MagicMock
-import sys
+from unittest.mock import patch
 import os
 from pathlib import Path
 
-# Add project root to Python path
 project_root = str(Path(__file__).resolve().parent.parent)
-if project_root not in sys.path:
-    sys.path.append(project_root)
-
-# Use relative imports for better compatibility
 
 
 class TestTeamService(unittest.TestCase):
     """Test cases for TeamService."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.team_service = TeamService()
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by every test."""
+        cls.team_service = TeamService()
+
+        with open(os.path.join(project_root, 'tests/fixtures/premier_league_page.html'), 'r', encoding='utf-8') as f:
+            cls.premier_league_page = f.read()
 
         # Sample data for testing
-        self.sample_teams = [
+        cls.sample_teams = [
             {
                 'name': 'Liverpool',
                 'url': 'https://fbref.com/en/squads/822bd0ba/Liverpool-Stats',
@@ -42,15 +40,23 @@ class TestTeamService(unittest.TestCase):
             }
         ]
 
-    @patch('services.team_service.TeamService.get_page_with_rate_limit')
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up fixtures shared by every test."""
+        cls.team_service.close()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # Saving is mocked per test so no mock outlives the test that set it up
+        patcher = patch.object(self.team_service, 'save_data_with_retry', return_value=True)
+        self.mock_save = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('src.services.team_service.TeamService.get_page_with_rate_limit')
     def test_get_premier_league_teams_success(self, mock_get_page):
         """Test successful retrieval of Premier League teams."""
         # Mock the HTML content
-        with open(os.path.join(project_root, 'tests/fixtures/premier_league_page.html'), 'r', encoding='utf-8') as f:
-            mock_get_page.return_value = f.read()
-
-        # Mock save_data_with_retry to return True
-        self.team_service.save_data_with_retry = MagicMock(return_value=True)
+        mock_get_page.return_value = self.premier_league_page
 
         # Call the method
         teams = self.team_service.get_premier_league_teams()
@@ -66,7 +72,7 @@ class TestTeamService(unittest.TestCase):
             self.assertIn('url', team)
             self.assertIn('id', team)
 
-    @patch('services.team_service.TeamService.get_page_with_rate_limit')
+    @patch('src.services.team_service.TeamService.get_page_with_rate_limit')
     def test_get_premier_league_teams_failure(self, mock_get_page):
         """Test failure to retrieve Premier League teams."""
         # Mock the get_page_with_rate_limit to return None
@@ -99,6 +105,13 @@ class TestTeamService(unittest.TestCase):
         self.assertEqual(team['name'], 'Manchester City')
         self.assertEqual(team['id'], 'b8fd03ef')
 
+    def test_get_team_by_name_short_and_mixed_case(self):
+        """Test partial matches shorter than an indexed name fragment and in another case."""
+        # Assertions
+        self.assertEqual(self.team_service.get_team_by_name('Ar', self.sample_teams)['id'], '18bb7c10')
+        self.assertEqual(self.team_service.get_team_by_name('CHESTER c', self.sample_teams)['id'], 'b8fd03ef')
+        self.assertIsNone(self.team_service.get_team_by_name('City Manchester', self.sample_teams))
+
     def test_get_team_by_name_no_match(self):
         """Test getting a team with no match."""
         # Call the method
@@ -108,8 +121,8 @@ class TestTeamService(unittest.TestCase):
         # Assertions
         self.assertIsNone(team)
 
-    @patch('services.team_service.TeamService.get_premier_league_teams')
-    @patch('services.team_stats_service.TeamStatsService.get_team_stats')
+    @patch('src.services.team_service.TeamService.get_premier_league_teams')
+    @patch('src.services.team_stats_service.TeamStatsService.get_team_stats')
     def test_get_team_detailed_stats(self, mock_get_team_stats, mock_get_teams):
         """Test getting detailed team statistics."""
         # Mock the get_premier_league_teams to return sample teams
@@ -134,9 +147,6 @@ class TestTeamService(unittest.TestCase):
         }
         mock_get_team_stats.return_value = sample_stats
 
-        # Mock save_data_with_retry to return True
-        self.team_service.save_data_with_retry = MagicMock(return_value=True)
-
         # Call the method
         stats = self.team_service.get_team_detailed_stats('Liverpool')
 
@@ -147,6 +157,27 @@ class TestTeamService(unittest.TestCase):
         self.assertIn('Mohamed Salah', stats['players'])
         self.assertEqual(stats['players']['Mohamed Salah']['position'], 'FW')
 
+    @patch('src.services.team_stats_service.TeamStatsService.iter_many')
+    def test_get_all_teams_detailed_stats(self, mock_iter_many):
+        """Test that each fetched team is saved as it completes."""
+        liverpool, arsenal, city = self.sample_teams
+        mock_iter_many.return_value = iter([
+            (arsenal, {'name': 'Arsenal', 'players': {}, 'matches': []}),
+            (liverpool, None),
+            (city, {'name': 'Manchester City', 'players': {}, 'matches': []})
+        ])
+        with patch.object(self.team_service, 'load_data', return_value=None), \
+                patch.dict(self.team_service.config._config_data, {'teams_to_analyze': []}):
+            team_stats = self.team_service.get_all_teams_detailed_stats(self.sample_teams)
+
+        # Assertions
+        self.assertEqual(sorted(team_stats), [arsenal['id'], city['id']])
+        mock_iter_many.assert_called_once_with(self.sample_teams)
+        saved = [call.args[1] for call in self.mock_save.call_args_list]
+        self.assertEqual(len(saved), 2)
+        self.assertTrue(saved[0].startswith(arsenal['id']))
+        self.assertTrue(saved[1].startswith(city['id']))
+
 
 if __name__ == '__main__':
     unittest.main()
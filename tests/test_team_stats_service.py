@@ -0,0 +1,143 @@
+"""
+Unit tests for the TeamStatsService class
+"""
+from src.services.team_stats_service import TeamStatsService
+import unittest
+from unittest.mock import ANY, MagicMock, patch
+import os
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parent.parent)
+
+
+class TestTeamStatsService(unittest.TestCase):
+    """Test cases for TeamStatsService."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.team_stats_service = TeamStatsService()
+        self.team_stats_service.page_cache = MagicMock()
+        self.team_stats_service.page_cache.get_parsed.return_value = None
+        self.team_url = 'https://fbref.com/en/squads/822bd0ba/Liverpool-Stats'
+
+        with open(os.path.join(project_root, 'tests/fixtures/team_page.html'), 'r', encoding='utf-8') as f:
+            self.team_page = f.read()
+
+    @patch('src.services.team_stats_service.TeamStatsService.get_page_with_rate_limit')
+    def test_get_team_stats_players(self, mock_get_page):
+        """Test extraction of player statistics."""
+        mock_get_page.return_value = self.team_page
+
+        stats = self.team_stats_service.get_team_stats(
+            self.team_url, 'Liverpool')
+
+        # Assertions
+        self.assertIsNotNone(stats)
+        self.assertEqual(stats['name'], 'Liverpool')
+        self.assertNotIn('_positions', stats)
+        self.team_stats_service.page_cache.set_parsed.assert_called_once_with(
+            ANY, stats)
+        self.assertEqual(
+            sorted(stats['players']), ['Alisson', 'Mohamed Salah', 'Virgil van Dijk'])
+
+        salah = stats['players']['Mohamed Salah']
+        self.assertEqual(
+            salah['url'], 'https://fbref.com/en/players/e342ad68/Mohamed-Salah')
+        self.assertEqual(salah['position'], 'FW')
+        self.assertEqual(salah['stats']['player'], 'Mohamed Salah')
+        self.assertEqual(salah['stats']['nationality'], 'eg EGY')
+        self.assertEqual(salah['stats']['minutes'], '2,700')
+        self.assertEqual(salah['stats']['goals'], '27')
+        self.assertEqual(salah['shooting_stats']['shots'], '103')
+
+        # Players missing from a table get no entry for it
+        self.assertNotIn('shooting_stats', stats['players']['Alisson'])
+
+    @patch('src.services.team_stats_service.TeamStatsService.get_page_with_rate_limit')
+    def test_get_team_stats_matches(self, mock_get_page):
+        """Test extraction of match logs."""
+        mock_get_page.return_value = self.team_page
+
+        stats = self.team_stats_service.get_team_stats(
+            self.team_url, 'Liverpool')
+
+        # Assertions
+        self.assertEqual(len(stats['matches']), 2)
+        self.assertEqual(stats['matches'][0], {
+            'date': '2024-08-17',
+            'comp': 'Premier League',
+            'venue': 'Away',
+            'result': 'W',
+            'goals_for': '2',
+            'goals_against': '0',
+            'opponent': 'Ipswich Town'
+        })
+
+    @patch('src.services.team_stats_service.TeamStatsService.get_page_with_rate_limit')
+    def test_get_many(self, mock_get_page):
+        """Test concurrent extraction for several teams."""
+        other_url = 'https://fbref.com/en/squads/b8fd03ef/Manchester-City-Stats'
+        mock_get_page.side_effect = lambda url, **kwargs: (
+            self.team_page if url == self.team_url else None)
+
+        results = self.team_stats_service.get_many([
+            {'name': 'Liverpool', 'url': self.team_url},
+            {'name': 'Manchester City', 'url': other_url}
+        ], concurrency=2)
+
+        # Assertions
+        self.assertEqual(results[self.team_url]['name'], 'Liverpool')
+        self.assertEqual(len(results[self.team_url]['players']), 3)
+        self.assertIsNone(results[other_url])
+
+    @patch('src.services.team_stats_service.TeamStatsService.get_page_with_rate_limit')
+    def test_get_many_parses_in_worker_processes(self, mock_get_page):
+        """Test that fetched pages are parsed in a process pool."""
+        other_url = 'https://fbref.com/en/squads/b8fd03ef/Manchester-City-Stats'
+        mock_get_page.return_value = self.team_page
+
+        with patch.dict(self.team_stats_service.config._config_data, {'parse_processes': 2}):
+            results = self.team_stats_service.get_many([
+                {'name': 'Liverpool', 'url': self.team_url},
+                {'name': 'Manchester City', 'url': other_url}
+            ])
+
+        # Assertions
+        self.assertEqual(results[other_url]['name'], 'Manchester City')
+        self.assertEqual(results[other_url]['url'], other_url)
+        self.assertEqual(
+            results[self.team_url]['players']['Mohamed Salah']['shooting_stats']['shots'], '103')
+        self.assertEqual(len(results[self.team_url]['matches']), 2)
+
+    @patch('src.services.team_stats_service.parse_team_page')
+    @patch('src.services.team_stats_service.TeamStatsService.get_page_with_rate_limit')
+    def test_get_team_stats_reuses_parsed_page(self, mock_get_page, mock_parse):
+        """Test that a page parsed before is not parsed again."""
+        mock_get_page.return_value = self.team_page
+        cached = {'url': self.team_url, 'name': 'Liverpool', 'timestamp': '20250101',
+                  'players': {}, 'matches': []}
+        self.team_stats_service.page_cache.get_parsed.return_value = cached
+
+        stats = self.team_stats_service.get_team_stats(
+            self.team_url, 'Liverpool')
+
+        # Assertions
+        self.assertIs(stats, cached)
+        self.assertEqual(stats['timestamp'], self.team_stats_service.get_timestamp())
+        mock_parse.assert_not_called()
+        self.team_stats_service.page_cache.set_parsed.assert_not_called()
+
+    @patch('src.services.team_stats_service.TeamStatsService.get_page_with_rate_limit')
+    def test_get_team_stats_failure(self, mock_get_page):
+        """Test failure to load the team page."""
+        mock_get_page.return_value = None
+
+        stats = self.team_stats_service.get_team_stats(
+            self.team_url, 'Liverpool')
+
+        # Assertions
+        self.assertIsNone(stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
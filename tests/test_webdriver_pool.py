@@ -0,0 +1,196 @@
+"""
+Unit tests for the WebDriverPool class
+"""
+from src.config import get_config
+from src.utils.webdriver_pool import WebDriverPool
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, PropertyMock, patch
+
+
+class TestWebDriverPool(unittest.TestCase):
+    """Test cases for WebDriverPool."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        with patch.dict(get_config()._config_data, {'webdriver_pool_size': 2}):
+            self.pool = WebDriverPool()
+
+        patcher = patch.object(self.pool, '_create_driver', side_effect=lambda: MagicMock())
+        self.mock_create = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.pool.close_all()
+
+    def test_creates_up_to_max_size_then_reuses(self):
+        """Test that drivers are created without waiting until the pool is full."""
+        first = self.pool.get_driver(wait_timeout=0.01)
+        second = self.pool.get_driver(wait_timeout=0.01)
+
+        # Assertions
+        self.assertIsNot(first, second)
+        self.assertEqual(self.mock_create.call_count, 2)
+        self.assertIsNone(self.pool.get_driver(wait_timeout=0.01))
+
+        self.pool.release_driver(first)
+        self.assertIs(self.pool.get_driver(wait_timeout=0.01), first)
+        self.assertEqual(self.mock_create.call_count, 2)
+
+        # The releasing thread gets its own driver back without a reset
+        first.delete_all_cookies.assert_not_called()
+
+    def test_waiter_gets_released_driver(self):
+        """Test that a caller waiting on a full pool gets the next released driver."""
+        drivers = [self.pool.get_driver(), self.pool.get_driver()]
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(self.pool.get_driver(wait_timeout=5)))
+        waiter.start()
+
+        self.pool.release_driver(drivers[0])
+        waiter.join()
+
+        # Assertions
+        self.assertEqual(result, [drivers[0]])
+        self.assertEqual(self.mock_create.call_count, 2)
+
+    def test_thread_driver_is_kept_until_thread_exit(self):
+        """Test that a thread reuses its driver, which returns to the pool when the thread ends."""
+        drivers = []
+
+        def render_pages():
+            drivers.append(self.pool.get_thread_driver(wait_timeout=0.01))
+            drivers.append(self.pool.get_thread_driver(wait_timeout=0.01))
+
+        worker = threading.Thread(target=render_pages)
+        worker.start()
+        worker.join()
+
+        # Assertions
+        self.assertIs(drivers[0], drivers[1])
+        self.assertEqual(self.mock_create.call_count, 1)
+        drivers[0].delete_all_cookies.assert_not_called()
+
+        # Another thread borrowing it gets it reset
+        self.assertIs(self.pool.get_driver(wait_timeout=0.01), drivers[0])
+        drivers[0].delete_all_cookies.assert_called_once()
+
+    def test_broken_driver_is_replaced(self):
+        """Test that a driver failing its reset is closed and its slot reused."""
+        drivers = []
+
+        def use_driver():
+            drivers.append(self.pool.get_driver())
+            drivers[0].delete_all_cookies.side_effect = Exception('session deleted')
+            self.pool.release_driver(drivers[0])
+
+        worker = threading.Thread(target=use_driver)
+        worker.start()
+        worker.join()
+
+        driver = self.pool.get_driver(wait_timeout=0.01)
+
+        # Assertions
+        self.assertIsNotNone(driver)
+        self.assertIsNot(driver, drivers[0])
+        drivers[0].quit.assert_called_once()
+        self.assertEqual(self.mock_create.call_count, 2)
+
+    def test_dead_pooled_driver_is_replaced(self):
+        """Test that an idle driver whose browser died is closed instead of handed out."""
+        driver = self.pool.get_driver(wait_timeout=0.01)
+        self.pool.release_driver(driver)
+        type(driver).current_url = PropertyMock(side_effect=Exception('chrome not reachable'))
+
+        replacement = self.pool.get_driver(wait_timeout=0.01)
+
+        # Assertions
+        self.assertIsNotNone(replacement)
+        self.assertIsNot(replacement, driver)
+        driver.quit.assert_called_once()
+
+    def test_failed_creation_frees_its_slot(self):
+        """Test that a driver creation raising an exception does not use up a slot."""
+        self.mock_create.side_effect = [RuntimeError('stealth failed'), RuntimeError('stealth failed'),
+                                        MagicMock(), MagicMock()]
+
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                self.pool.get_driver(wait_timeout=0.01)
+
+        # Assertions
+        self.assertIsNotNone(self.pool.get_driver(wait_timeout=0.01))
+        self.assertIsNotNone(self.pool.get_driver(wait_timeout=0.01))
+
+    def test_dead_thread_driver_is_replaced(self):
+        """Test that a thread's driver whose browser died (session id still set) is closed and replaced."""
+        driver = self.pool.get_thread_driver(wait_timeout=0.01)
+        type(driver).current_url = PropertyMock(side_effect=Exception('chrome not reachable'))
+
+        replacement = self.pool.get_thread_driver(wait_timeout=0.01)
+
+        # Assertions
+        self.assertIsNot(replacement, driver)
+        driver.quit.assert_called_once()
+        self.assertIs(self.pool.get_thread_driver(wait_timeout=0.01), replacement)
+
+    def test_warmer_starts_drivers_ahead_of_demand(self):
+        """Test that the warmer starts with the first checkout, keeps min idle drivers and stops on close_all."""
+        with patch.dict(get_config()._config_data, {'webdriver_pool_size': 2, 'webdriver_min_idle': 1}), \
+                patch.object(WebDriverPool, '_create_driver', side_effect=lambda: MagicMock()) as mock_create:
+            pool = WebDriverPool()
+            try:
+                # Creating the pool (i.e. importing the module) starts nothing
+                self.assertIsNone(pool._warmer)
+                mock_create.assert_not_called()
+
+                first = pool.get_driver(wait_timeout=0.01)
+                deadline = time.monotonic() + 5
+                while pool.pool.qsize() < 1 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+                # Assertions
+                self.assertEqual(pool.pool.qsize(), 1)
+                second = pool.get_driver(wait_timeout=0.01)
+                self.assertIsNotNone(second)
+                self.assertIsNot(second, first)
+                second.delete_all_cookies.assert_not_called()
+                self.assertEqual(mock_create.call_count, 2)
+            finally:
+                pool.close_all()
+
+            self.assertFalse(pool._warmer.is_alive())
+            self.assertEqual(pool.pool.qsize(), 0)
+
+    @patch('src.utils.webdriver_pool.time.sleep')
+    @patch('selenium_stealth.stealth')
+    @patch('selenium.webdriver.Chrome')
+    def test_create_driver_retries_startup_failures(self, mock_chrome, mock_stealth, mock_sleep):
+        """Test that a failed Chrome startup is retried with backoff."""
+        from selenium.common.exceptions import WebDriverException
+        driver = MagicMock()
+        mock_chrome.side_effect = [WebDriverException('port in use'), driver]
+
+        # Assertions (calling the unpatched method)
+        self.assertIs(WebDriverPool._create_driver(self.pool), driver)
+        self.assertEqual(mock_chrome.call_count, 2)
+        mock_sleep.assert_called_once()
+
+
+    @patch('selenium_stealth.stealth')
+    @patch('selenium.webdriver.Chrome')
+    def test_create_driver_uses_settings_changed_after_pool_creation(self, mock_chrome, mock_stealth):
+        """Test that settings changed after the pool is created (e.g. --headless) reach Chrome."""
+        settings = dict(get_config().get('webdriver_settings', {}), headless=True)
+
+        with patch.dict(get_config()._config_data, {'webdriver_settings': settings}):
+            WebDriverPool._create_driver(self.pool)
+
+        # Assertions
+        self.assertIn('--headless', mock_chrome.call_args.kwargs['options'].arguments)
+
+
+if __name__ == '__main__':
+    unittest.main()